@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Time to render a 50,000-cell scorecard grid (1,000 rows of 50 cells) per value
+type with one display_many call over all its cells, compared with formatting
+each cell on its own, both plain and localized (in German).
+
+    $ python benchmarks/display.py
+"""
+import decimal
+import itertools
+import random
+import timeit
+
+import django
+from django.conf import settings
+
+ROWS = 1000
+COLUMNS = 50
+REPEAT = 5
+
+
+def grid(type_key):
+    """
+    a grid of values of the given type, with the repetition typical of
+    scorecards (a few hundred distinct values)
+    """
+    rng = random.Random(type_key)
+    if type_key == "traffic-light":
+        cells = [rng.randint(1, 3) for _ in range(ROWS * COLUMNS)]
+    else:
+        cells = [decimal.Decimal(rng.randint(0, 500)) / 100 for _ in range(ROWS * COLUMNS)]
+    return [cells[row * COLUMNS:(row + 1) * COLUMNS] for row in range(ROWS)]
+
+
+def seconds(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    from pinax.types.values import VALUE_TYPES, display_many, localized_formatter
+
+    print("milliseconds per grid")
+    print(f"{'type':<16}{'display':>10}{'many':>10}{'localized':>12}{'many':>10}")
+    for type_key in ["monetary", "percentage", "hours", "traffic-light"]:
+        rows = grid(type_key)
+        display = VALUE_TYPES[type_key].display
+        localize = localized_formatter(VALUE_TYPES[type_key])
+
+        def many(localize=False):
+            cells = display_many(type_key, itertools.chain.from_iterable(rows), localize)
+            return [cells[row * COLUMNS:(row + 1) * COLUMNS] for row in range(ROWS)]
+
+        timings = [
+            seconds(lambda: [[display(value) for value in row] for row in rows]),
+            seconds(many),
+            seconds(lambda: [[localize(value) for value in row] for row in rows]),
+            seconds(lambda: many(localize=True)),
+        ]
+        print(f"{type_key:<16}" + "".join(
+            f"{timing * 1000:>{width}.1f}" for timing, width in zip(timings, [10, 10, 12, 10])
+        ))
+
+
+if __name__ == "__main__":
+    settings.configure(USE_L10N=True, LANGUAGE_CODE="de")
+    django.setup()
+    main()
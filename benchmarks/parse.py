@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Throughput of pinax.types.periods.parse for each documented input format,
+compared with the dateutil path the yearly and monthly formats used to take.
+
+    $ python benchmarks/parse.py
+"""
+import timeit
+
+from pinax.types.periods import (
+    MonthlyPeriod,
+    YearlyPeriod,
+    dateutil_parse,
+    parse,
+)
+
+NUMBER = 20000
+
+
+def dateutil_monthly(value):
+    return MonthlyPeriod.for_date(dateutil_parse(value))
+
+
+def dateutil_yearly(value):
+    return YearlyPeriod.for_date(dateutil_parse(value))
+
+
+# each format with the code path it took before the fast paths, if any
+FORMATS = [
+    ("2015W03", None),
+    ("2015Q1", None),
+    ("2015", dateutil_yearly),
+    ("1/2015", dateutil_monthly),
+    ("01/2015", dateutil_monthly),
+    ("Jan 2015", dateutil_monthly),
+    ("January 2015", dateutil_monthly),
+    ("2015-01", dateutil_monthly),
+]
+
+
+def throughput(func, value):
+    seconds = min(timeit.repeat(lambda: func(value), number=NUMBER, repeat=3))
+    return NUMBER / seconds
+
+
+def main():
+    print(f"{'format':<16}{'dateutil/s':>14}{'parse/s':>14}{'speedup':>10}")
+    for value, old_path in FORMATS:
+        after = throughput(parse, value)
+        if old_path is not None:
+            before = throughput(old_path, value)
+            print(f"{value:<16}{before:>14,.0f}{after:>14,.0f}{after / before:>9.1f}x")
+        else:
+            print(f"{value:<16}{'-':>14}{after:>14,.0f}{'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Conversion of value type values to compact numpy arrays.
+
+Requires numpy (``pip install pinax-types[numpy]``).
+"""
+import decimal
+
+from django.core.exceptions import ValidationError
+
+import numpy as np
+
+from .values import (
+    VALUE_TYPES,
+    BooleanValueType,
+    DecimalValueType,
+    IntegerValueType,
+    TrafficLightValueType,
+    invalid_flags,
+)
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+# the most bad indices listed in a conversion error
+MAX_REPORTED_INDICES = 10
+
+
+def invalid_array(value_type, values):
+    """
+    whether each value of a 1-D numpy array is invalid, vectorized where the
+    array's dtype allows it (see values.validate_many)
+    """
+    if values.dtype.kind == "U" and value_type is BooleanValueType:
+        return ~np.isin(values, value_type.choices)
+    if values.dtype.kind in "iu":
+        if value_type is TrafficLightValueType:
+            return ~np.isin(values, value_type.choices)
+        if issubclass(value_type, (IntegerValueType, DecimalValueType)):
+            return np.zeros(values.shape, dtype=bool)
+    return np.array(invalid_flags(value_type, values.tolist()), dtype=bool)
+
+
+def to_int64(value):
+    number = int(value)
+    if not INT64_MIN <= number <= INT64_MAX:
+        raise OverflowError(f"{value} does not fit in 64 bits")
+    return number
+
+
+def to_boolean(value):
+    BooleanValueType.validate(value)
+    return value == "true"
+
+
+def to_traffic_light(value):
+    TrafficLightValueType.validate(value)
+    return int(value)
+
+
+def to_float(value):
+    return float(decimal.Decimal(value))
+
+
+def to_scaled(scale):
+    """
+    returns the function converting a decimal value to the integer number of
+    10 ** -scale units it holds, exactly (e.g. cents for a scale of 2)
+    """
+    def convert(value):
+        sign, digits, exponent = decimal.Decimal(value).as_tuple()
+        if not isinstance(exponent, int):
+            raise ValueError(f"{value} is not a finite number")
+        number = int("".join(map(str, digits)))
+        exponent += scale
+        if exponent >= 0:
+            number *= 10 ** exponent
+        else:
+            number, remainder = divmod(number, 10 ** -exponent)
+            if remainder:
+                raise ValueError(f"{value} has more than {scale} decimal places")
+        return to_int64(-number if sign else number)
+    return convert
+
+
+def converter(value_type, scale=None):
+    """
+    returns the (conversion function, numpy dtype) for the given value type
+    class; scale (decimal types only) selects exact fixed-point int64 values
+    """
+    if issubclass(value_type, DecimalValueType):
+        if scale is None:
+            return to_float, np.float64
+        return to_scaled(scale), np.int64
+    if scale is not None:
+        raise ValueError("scale only applies to decimal value types")
+    if issubclass(value_type, IntegerValueType):
+        return to_int64, np.int64
+    if issubclass(value_type, BooleanValueType):
+        return to_boolean, np.bool_
+    if issubclass(value_type, TrafficLightValueType):
+        return to_traffic_light, np.uint8
+    raise ValueError(f"{value_type.__name__} values cannot be converted to an array")
+
+
+def to_array(type_key, values, scale=None):
+    """
+    validates and converts values of the given value type to a numpy array in
+    one pass: integer to int64, boolean to bool, traffic-light to uint8 and
+    the decimal types (decimal, monetary, hours, percentage) to float64 or,
+    given a scale, to exact int64 multiples of 10 ** -scale (e.g. cents).
+
+    Each distinct value is converted only once. Raises ValidationError naming
+    the indices of values that are invalid or cannot be represented (all of
+    them are in its params["indices"]).
+    """
+    convert, dtype = converter(VALUE_TYPES[type_key], scale)
+    memo = {}
+    converted = []
+    invalid = []
+    for index, value in enumerate(values):
+        try:
+            result = memo[value]
+        except KeyError:
+            try:
+                result = memo[value] = convert(value)
+            except (ValidationError, ValueError, TypeError, OverflowError, decimal.InvalidOperation):
+                result = memo[value] = None
+        except TypeError:
+            result = None
+        if result is None:
+            invalid.append(index)
+        converted.append(result)
+    if invalid:
+        indices = ", ".join(str(index) for index in invalid[:MAX_REPORTED_INDICES])
+        more = f" and {len(invalid) - MAX_REPORTED_INDICES} more" if len(invalid) > MAX_REPORTED_INDICES else ""
+        raise ValidationError(
+            f"Incorrect {type_key} values at indices {indices}{more}",
+            code="invalid",
+            params={"indices": invalid},
+        )
+    return np.array(converted, dtype=dtype)
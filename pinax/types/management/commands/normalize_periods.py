@@ -0,0 +1,102 @@
+import time
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import CharField, ExpressionWrapper, F
+
+from pinax.types.periods import (
+    DEFAULT_PARSE_MEMO_SIZE,
+    parse_or_error,
+    validate,
+)
+from pinax.types.periods.fields import PeriodField
+
+
+def normalize(value):
+    """
+    returns a (raw period, None) tuple for a valid raw period or a value
+    parse can normalize, and a (None, message) tuple otherwise
+    """
+    try:
+        validate(value)
+    except (ValidationError, ValueError, IndexError):
+        return parse_or_error(value)
+    return value, None
+
+
+class Command(BaseCommand):
+
+    help = "Normalize free-form values (e.g. 2015W3, Jan 2015) in a period column to raw periods"
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="the model, as app_label.ModelName")
+        parser.add_argument("field", help="the name of the period field")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="report changes without saving them")
+        parser.add_argument(
+            "--start-after",
+            help="only scan rows with a greater primary key, to resume an interrupted run"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+            field = model._meta.get_field(options["field"])
+        except (LookupError, ValueError, FieldDoesNotExist) as error:
+            raise CommandError(str(error))
+        if not isinstance(field, PeriodField):
+            raise CommandError(f"{options['model']}.{field.name} is not a PeriodField")
+        # read the stored strings, bypassing the period field's conversion
+        queryset = model._default_manager.annotate(
+            stored_period=ExpressionWrapper(F(field.name), output_field=CharField())
+        ).order_by("pk").values_list("pk", "stored_period")
+
+        self.memo = {}
+        scanned = changed = failed = 0
+        last_pk = options["start_after"]
+        started = time.monotonic()
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch[:options["batch_size"]])
+            if not rows:
+                break
+            updates, failures = self.normalize_rows(rows)
+            if updates and not options["dry_run"]:
+                objs = [model(pk=pk, **{field.name: value}) for pk, value in updates]
+                with transaction.atomic(using=queryset.db):
+                    model._default_manager.bulk_update(objs, [field.name])
+            for pk, error in failures:
+                self.stderr.write(f"{pk}: {error}")
+            last_pk = rows[-1][0]
+            scanned, changed, failed = scanned + len(rows), changed + len(updates), failed + len(failures)
+            self.stdout.write(f"scanned {scanned} rows up to pk {last_pk}, {changed} to change")
+
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed else 0
+        verb = "would change" if options["dry_run"] else "changed"
+        self.stdout.write(
+            f"{scanned} rows scanned, {verb} {changed}, {failed} unparseable "
+            f"in {elapsed:.1f}s ({rate:.0f} rows/s)"
+        )
+
+    def normalize_rows(self, rows):
+        """
+        the (pk, raw period) updates and (pk, message) failures for a batch
+        of (pk, stored value) rows, normalizing each distinct value once
+        """
+        updates, failures = [], []
+        for pk, value in rows:
+            if not value:
+                continue
+            if value not in self.memo:
+                if len(self.memo) >= DEFAULT_PARSE_MEMO_SIZE:
+                    self.memo.clear()
+                self.memo[value] = normalize(value)
+            result, error = self.memo[value]
+            if error is not None:
+                failures.append((pk, error))
+            elif result != value:
+                updates.append((pk, result))
+        return updates, failures
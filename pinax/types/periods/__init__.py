@@ -1,12 +1,13 @@
+import bisect
 import calendar
 import datetime
-import operator
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
 
 from django.core.exceptions import ValidationError
 
-from dateutil.parser import parse as dateutil_parse
-
 
 class Period:  # abstract base class
 
@@ -16,13 +17,85 @@ class Period:  # abstract base class
     maximum = None
     contains = []
 
+    # derived values (_start_end, _ordinal, _year, _sort_key) are filled in
+    # on first use
+    __slots__ = ("raw_value", "_hash", "_start_end", "_ordinal", "_year", "_sort_key")
+
     def __init__(self, raw_value):
         self.validate(raw_value)
-        self.raw_value = raw_value
+        object.__setattr__(self, "raw_value", raw_value)
+        object.__setattr__(self, "_hash", hash(raw_value))
+
+    @classmethod
+    def trusted(cls, raw_value):
+        """
+        build an instance without validating raw_value, for values already
+        known to be valid (e.g. read back from the database)
+        """
+        period = cls.__new__(cls)
+        object.__setattr__(period, "raw_value", raw_value)
+        object.__setattr__(period, "_hash", hash(raw_value))
+        return period
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} instances are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} instances are immutable")
+
+    def __reduce__(self):
+        return get_period, (self.raw_value,)
+
+    def __hash__(self):
+        return self._hash
 
     def __str__(self):
         return self.raw_value
 
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.raw_value}>"
+
+    @property
+    def start(self):
+        return self.get_start_end()[0]
+
+    @property
+    def end(self):
+        return self.get_start_end()[1]
+
+    @property
+    def ordinal(self):
+        try:
+            return self._ordinal
+        except AttributeError:
+            ordinal = self.to_ordinal(self.raw_value)
+            object.__setattr__(self, "_ordinal", ordinal)
+            return ordinal
+
+    @property
+    def year(self):
+        try:
+            return self._year
+        except AttributeError:
+            year = int(self.raw_value[2:6])
+            object.__setattr__(self, "_year", year)
+            return year
+
+    @property
+    def sort_key(self):
+        """
+        an int ordering periods of any type by (start date, end date,
+        granularity)
+        """
+        try:
+            return self._sort_key
+        except AttributeError:
+            start, end = self.get_start_end()
+            granularity = GRANULARITIES[self.prefix]
+            sort_key = (start.toordinal() << 24) | (end.toordinal() << 2) | granularity
+            object.__setattr__(self, "_sort_key", sort_key)
+            return sort_key
+
     def includes(self, period):
         """
         quarter.includes(month) : True|False
@@ -30,8 +103,8 @@ class Period:  # abstract base class
         if self == period:
             return True
         if period.prefix in self.contains:
-            start, end = self.start_end(self.raw_value)
-            start2, end2 = period.start_end(period.raw_value)
+            start, end = self.get_start_end()
+            start2, end2 = period.get_start_end()
             return start <= start2 and end >= end2
         return False
 
@@ -39,11 +112,11 @@ class Period:  # abstract base class
         self.validate_can_contain_type(period_type)
         periods = []
         if self.is_period_type(period_type):
-            periods.append(get_period(self.raw_value))
+            periods.append(self)
         klass = PERIOD_TYPES[period_type]
         start, end = self.get_start_end()
-        start, end = klass.for_date(start), klass.for_date(end)
-        for period_raw in klass.range(start, end, inclusive=True):
+        ordinals = range(klass.ordinal_for_date(start), klass.ordinal_for_date(end) + 1)
+        for period_raw in PeriodRange(klass, ordinals):
             periods.append(get_period(period_raw))
         return periods
 
@@ -70,7 +143,15 @@ class Period:  # abstract base class
             )
 
     def get_start_end(self):
-        return self.start_end(self.raw_value)
+        try:
+            return self._start_end
+        except AttributeError:
+            start_end = self.start_end(self.raw_value)
+            object.__setattr__(self, "_start_end", start_end)
+            return start_end
+
+    def get_ordinal(self):
+        return self.ordinal
 
     def get_display(self):
         return self.display(self.raw_value)
@@ -89,6 +170,34 @@ class Period:  # abstract base class
     def is_future(self):
         return self.current_period() < self
 
+    @classmethod
+    def overlapping(cls, start, end):
+        """
+        the PeriodRange of periods of this type sharing at least one day with
+        the dates from start to end (inclusive)
+        """
+        return PeriodRange(cls, range(cls.ordinal_for_date(start), cls.ordinal_for_date(end) + 1))
+
+    @classmethod
+    def within(cls, start, end):
+        """
+        the PeriodRange of periods of this type lying entirely within the
+        dates from start to end (inclusive)
+        """
+        low, high = cls.ordinal_for_date(start), cls.ordinal_for_date(end)
+        if cls.start_end(cls.from_ordinal(low))[0] < start:
+            low += 1
+        if cls.start_end(cls.from_ordinal(high))[1] > end:
+            high -= 1
+        return PeriodRange(cls, range(low, max(high + 1, low)))
+
+    @classmethod
+    def range(cls, start, stop, inclusive=False):
+        cls.validate(start)
+        cls.validate(stop)
+        ordinal_stop = cls.to_ordinal(stop) + 1 if inclusive else cls.to_ordinal(stop)
+        return PeriodRange(cls, range(cls.to_ordinal(start), ordinal_stop))
+
     @classmethod
     def validate(cls, period):
         regex = f"^{cls.prefix}-" + cls.validation_regex
@@ -109,23 +218,124 @@ class Period:  # abstract base class
                 )
 
     def __eq__(self, other):
-        return type(self) == type(other) and self.raw_value == other.raw_value
+        # __class__ rather than type() so lazy proxies of periods compare equal
+        return (
+            isinstance(other, Period) and
+            self.__class__ is other.__class__ and
+            self.raw_value == other.raw_value
+        )
 
     def __ne__(self, other):
-        return type(self) != type(other) or self.raw_value != other.raw_value
+        return not self == other
 
     def __lt__(self, other):
-        # @@@ we might want to be smart and be able to do things like "Q-2014-Q4" < "Y-2015"
-        return type(self) == type(other) and self.raw_value < other.raw_value
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self.sort_key < other.sort_key
 
     def __gt__(self, other):
-        return type(self) == type(other) and self.raw_value > other.raw_value
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self.sort_key > other.sort_key
 
     def __le__(self, other):
-        return type(self) == type(other) and self.raw_value <= other.raw_value
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
 
     def __ge__(self, other):
-        return type(self) == type(other) and self.raw_value >= other.raw_value
+        if not isinstance(other, Period):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+    def __add__(self, other):
+        """
+        month + 2 : the month two months later
+        """
+        if not isinstance(other, int):
+            return NotImplemented
+        return get_period(self.from_ordinal(self.ordinal + other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """
+        month - 2 : the month two months earlier
+        month - other_month : the number of months between them
+        """
+        if isinstance(other, int):
+            return self + -other
+        if isinstance(other, Period) and self.__class__ is other.__class__:
+            return self.ordinal - other.ordinal
+        return NotImplemented
+
+
+class PeriodRange(Sequence):
+    """
+    lazy sequence of the raw periods of one period type whose ordinals fall in
+    the given range object.
+
+    Length, membership, indexing, slicing and reversing are all done on the
+    ordinals, so no raw value is built until it is asked for.
+    """
+
+    def __init__(self, period_class, ordinals):
+        self.period_class = period_class
+        self.ordinals = ordinals
+
+    def __repr__(self):
+        return f"PeriodRange({self.period_class.__name__}, {self.ordinals!r})"
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PeriodRange(self.period_class, self.ordinals[index])
+        return self.period_class.from_ordinal(self.ordinals[index])
+
+    def __iter__(self):
+        from_ordinal = self.period_class.from_ordinal
+        for ordinal in self.ordinals:
+            yield from_ordinal(ordinal)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __contains__(self, period):
+        ordinal = self.ordinal_of(period)
+        return ordinal is not None and ordinal in self.ordinals
+
+    def __eq__(self, other):
+        if not isinstance(other, PeriodRange):
+            return NotImplemented
+        return self.period_class is other.period_class and self.ordinals == other.ordinals
+
+    def ordinal_of(self, period):
+        """
+        the ordinal of the given period (raw value or Period), or None if it
+        is not a canonical period of this range's type
+        """
+        if isinstance(period, Period):
+            period = period.raw_value
+        if not isinstance(period, str) or period[:1] != self.period_class.prefix:
+            return None
+        try:
+            ordinal = self.period_class.to_ordinal(period)
+        except (ValueError, IndexError):
+            return None
+        if self.period_class.from_ordinal(ordinal) != period:
+            return None
+        return ordinal
+
+    def index(self, period):
+        ordinal = self.ordinal_of(period)
+        if ordinal is None or ordinal not in self.ordinals:
+            raise ValueError(f"{period} is not in range")
+        return self.ordinals.index(ordinal)
+
+    def count(self, period):
+        return int(period in self)
 
 
 class WeeklyPeriod(Period):
@@ -135,51 +345,43 @@ class WeeklyPeriod(Period):
     minimum = 1
     maximum = 53
 
+    __slots__ = ()
+
     @classmethod
     def from_parts(cls, year, week):
         return "{}-{:d}-{:02d}".format(cls.prefix, int(year), int(week))
 
     @classmethod
     def for_date(cls, date):
-        year = date.isocalendar()[0]
-        week = date.isocalendar()[1]
-        return cls.from_parts(year, week)
+        year, week, _ = date.isocalendar()
+        return f"{cls.prefix}-{year:d}-{week:02d}"
+
+    @classmethod
+    def ordinal_for_date(cls, date):
+        return (date.toordinal() - 1) // 7
 
     @classmethod
     def start_end(cls, period):
-        year = int(period[2:6])
-        week = int(period[7:])
-        start = iso_week_to_gregorian(year, week)
+        start = datetime.date.fromordinal(cls.to_ordinal(period) * 7 + 1)
         end = start + datetime.timedelta(days=6)
         return start, end
 
     @classmethod
-    def range(cls, start, stop, inclusive=False):
-        cls.validate(start)
-        cls.validate(stop)
-        year_start = int(start[2:6])
-        week_start = int(start[7:])
-        year_stop = int(stop[2:6])
-        week_stop = int(stop[7:])
-        year = year_start
-        week = week_start
-        op = operator.le if inclusive else operator.lt
-        while op((year, week), (year_stop, week_stop)):
-            yield f"{cls.prefix}-{year:d}-{week:02d}"
-            week += 1
-            if datetime.date(year, 12, 31).isocalendar()[1] == 53:
-                weeks_in_year = 53
-            else:
-                weeks_in_year = 52
-            if week == weeks_in_year + 1:
-                week = 1
-                year += 1
+    def to_ordinal(cls, period):
+        """
+        weeks since the ISO week starting Monday 0001-01-01
+        """
+        return iso_calendar.week_ordinal(int(period[2:6]), int(period[7:]))
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        year, week = iso_calendar.year_week(ordinal)
+        return f"{cls.prefix}-{year:d}-{week:02d}"
 
     @classmethod
     def display(cls, period):
-        year = int(period[2:6])
-        week = int(period[7:])
-        return iso_week_to_gregorian(year, week).strftime("Week of %b %d, %Y")
+        start = datetime.date.fromordinal(cls.to_ordinal(period) * 7 + 1)
+        return start.strftime("Week of %b %d, %Y")
 
 
 class QuarterlyPeriod(Period):
@@ -190,6 +392,8 @@ class QuarterlyPeriod(Period):
     maximum = 4
     contains = ["M", "W"]
 
+    __slots__ = ()
+
     @classmethod
     def from_parts(cls, year, quarter):
         return "{}-{:d}-{:d}".format(cls.prefix, int(year), int(quarter))
@@ -199,6 +403,10 @@ class QuarterlyPeriod(Period):
         quarter = 1 + (date.month - 1) // 3
         return cls.from_parts(date.year, quarter)
 
+    @classmethod
+    def ordinal_for_date(cls, date):
+        return date.year * 4 + (date.month - 1) // 3
+
     @classmethod
     def start_end(cls, period):
         year = int(period[2:6])
@@ -210,22 +418,16 @@ class QuarterlyPeriod(Period):
         return start, end
 
     @classmethod
-    def range(cls, start, stop, inclusive=False):
-        cls.validate(start)
-        cls.validate(stop)
-        year_start = int(start[2:6])
-        quarter_start = int(start[7])
-        year_stop = int(stop[2:6])
-        quarter_stop = int(stop[7])
-        year = year_start
-        quarter = quarter_start
-        op = operator.le if inclusive else operator.lt
-        while op((year, quarter), (year_stop, quarter_stop)):
-            yield f"{cls.prefix}-{year:d}-{quarter:d}"
-            quarter += 1
-            if quarter == 5:
-                quarter = 1
-                year += 1
+    def to_ordinal(cls, period):
+        """
+        quarters since year 0
+        """
+        return int(period[2:6]) * 4 + int(period[7]) - 1
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        year, quarter = divmod(ordinal, 4)
+        return f"{cls.prefix}-{year:d}-{quarter + 1:d}"
 
     @classmethod
     def display(cls, period):
@@ -242,10 +444,16 @@ class MonthlyPeriod(Period):
     maximum = 12
     contains = ["W"]
 
+    __slots__ = ()
+
     @classmethod
     def for_date(cls, date):
         return f"{cls.prefix}-{date.year:d}-{date.month:02d}"
 
+    @classmethod
+    def ordinal_for_date(cls, date):
+        return date.year * 12 + date.month - 1
+
     @classmethod
     def start_end(cls, period):
         year = int(period[2:6])
@@ -256,22 +464,16 @@ class MonthlyPeriod(Period):
         return start, end
 
     @classmethod
-    def range(cls, start, stop, inclusive=False):
-        cls.validate(start)
-        cls.validate(stop)
-        year_start = int(start[2:6])
-        month_start = int(start[7:])
-        year_stop = int(stop[2:6])
-        month_stop = int(stop[7:])
-        year = year_start
-        month = month_start
-        op = operator.le if inclusive else operator.lt
-        while op((year, month), (year_stop, month_stop)):
-            yield f"{cls.prefix}-{year:d}-{month:02d}"
-            month += 1
-            if month == 13:
-                month = 1
-                year += 1
+    def to_ordinal(cls, period):
+        """
+        months since year 0
+        """
+        return int(period[2:6]) * 12 + int(period[7:]) - 1
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        year, month = divmod(ordinal, 12)
+        return f"{cls.prefix}-{year:d}-{month + 1:02d}"
 
     @classmethod
     def display(cls, period):
@@ -286,10 +488,16 @@ class YearlyPeriod(Period):
     validation_regex = r"\d{4}$"
     contains = ["Q", "M", "W"]
 
+    __slots__ = ()
+
     @classmethod
     def for_date(cls, date):
         return f"{cls.prefix}-{date.year:d}"
 
+    @classmethod
+    def ordinal_for_date(cls, date):
+        return date.year
+
     @classmethod
     def start_end(cls, period):
         year = int(period[2:])
@@ -298,16 +506,12 @@ class YearlyPeriod(Period):
         return start, end
 
     @classmethod
-    def range(cls, start, stop, inclusive=False):
-        cls.validate(start)
-        cls.validate(stop)
-        year_start = int(start[2:])
-        year_stop = int(stop[2:])
-        year = year_start
-        op = operator.le if inclusive else operator.lt
-        while op(year, year_stop):
-            yield f"{cls.prefix}-{year:d}"
-            year += 1
+    def to_ordinal(cls, period):
+        return int(period[2:])
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        return f"{cls.prefix}-{ordinal:d}"
 
     @classmethod
     def display(cls, period):
@@ -341,6 +545,21 @@ PERIOD_PREFIXES = {
     for period_type_class in PERIOD_TYPES.values()
 }
 
+# tie-breaker in Period.sort_key, from finest to coarsest
+GRANULARITIES = {
+    "W": 0,
+    "M": 1,
+    "Q": 2,
+    "Y": 3,
+}
+
+DEFAULT_PERIOD_CACHE_SIZE = 8192
+
+DEFAULT_PARSE_MEMO_SIZE = 65536
+
+ISO_CALENDAR_FIRST_YEAR = 1900
+ISO_CALENDAR_LAST_YEAR = 2200
+
 
 def parse(value):
     """
@@ -359,29 +578,235 @@ def parse(value):
         year, quarter = value[:4], value[5]
         result = QuarterlyPeriod.from_parts(year, quarter)
     elif len(value) == 4 and value.isdigit():
-        result = YearlyPeriod.for_date(dateutil_parse(value))
+        result = f"{YearlyPeriod.prefix}-{int(value):d}"
     else:
-        try:
-            result = MonthlyPeriod.for_date(dateutil_parse(value))
-        except ValueError:
-            pass
+        result = parse_month(value)
     if result:
         validate(result)
     return result
 
 
+MONTH_NAMES = [
+    "january", "february", "march", "april", "may", "june", "july",
+    "august", "september", "october", "november", "december",
+]
+
+MONTHS = {
+    **{name: month for month, name in enumerate(MONTH_NAMES, 1)},
+    **{name[:3]: month for month, name in enumerate(MONTH_NAMES, 1)},
+}
+
+
+def parse_month_parts(value):
+    """
+    fast path for 1/2015, 01/2015, Jan 2015, January 2015 and 2015-01,
+    returning a (year, month) tuple or None
+    """
+    if "/" in value:
+        month, _, year = value.partition("/")
+        month = int(month) if 1 <= len(month) <= 2 and month.isdigit() else None
+    elif len(value) == 7 and value[4] == "-":
+        year, month = value[:4], value[5:]
+        month = int(month) if month.isdigit() else None
+    else:
+        month, _, year = value.strip().partition(" ")
+        month = MONTHS.get(month.lower())
+        year = year.strip()
+    if month is None or not 1 <= month <= 12:
+        return None
+    if len(year) != 4 or not year.isdigit():
+        return None
+    return int(year), month
+
+
+def parse_month(value):
+    parts = parse_month_parts(value)
+    if parts is not None:
+        return "{}-{:d}-{:02d}".format(MonthlyPeriod.prefix, *parts)
+    try:
+        return MonthlyPeriod.for_date(dateutil_parse(value))
+    except ValueError:
+        return None
+
+
+def dateutil_parse(value):
+    """
+    fallback for formats parse() has no fast path for; dateutil is only
+    imported the first time it is needed
+    """
+    from dateutil.parser import parse
+    return parse(value)
+
+
+class ParseReport:
+    """
+    failures collected by parse_many: count is the number of values seen and
+    errors a list of (index, message) pairs
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = []
+
+    def __len__(self):
+        return len(self.errors)
+
+    @property
+    def indices(self):
+        return [index for index, _ in self.errors]
+
+
+def parse_or_error(value):
+    """
+    returns a (raw period, None) tuple for a parseable value and a
+    (None, message) tuple otherwise (including for any value that is not a
+    string)
+    """
+    if not isinstance(value, str):
+        return None, f"Cannot Parse: {value}"
+    try:
+        result = parse(value)
+    except ValidationError as error:
+        return None, " ".join(error.messages)
+    except (TypeError, ValueError, OverflowError):
+        result = None
+    if result is None:
+        return None, f"Cannot Parse: {value}"
+    return result, None
+
+
+def parse_many(values, report=None, memo_size=DEFAULT_PARSE_MEMO_SIZE):
+    """
+    lazily yields parse(value) for each of the given values, or None where a
+    value cannot be parsed; never raises.
+
+    Distinct values are only parsed once (remembering up to memo_size of them)
+    and failures are recorded in the optional ParseReport.
+    """
+    memo = {}
+    index = -1
+    try:
+        for index, value in enumerate(values):
+            try:
+                result, error = memo[value]
+            except KeyError:
+                result, error = memo[value] = parse_or_error(value)
+                if len(memo) > memo_size:
+                    del memo[value]
+            except TypeError:
+                result, error = parse_or_error(value)
+            if error is not None and report is not None:
+                report.errors.append((index, error))
+            yield result
+    finally:
+        if report is not None:
+            report.count = index + 1
+
+
 def validate(raw_value):
     if raw_value[0] not in PERIOD_PREFIXES:
         raise ValidationError(f"invalid prefix in {raw_value}")
     return PERIOD_PREFIXES[raw_value[0]].validate(raw_value)
 
 
-def get_period(raw_value):
+class PeriodCache:
+    """
+    bounded LRU registry of interned Period instances, keyed by raw value.
+
+    A maxsize of None means unbounded and 0 disables interning. Periods
+    interned by a trusted lookup are validated by the first strict one.
+    """
+
+    def __init__(self, maxsize=DEFAULT_PERIOD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.periods = OrderedDict()
+        # raw values interned by trusted lookups, validated on their first
+        # strict lookup
+        self.unverified = set()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.periods)
+
+    def get(self, raw_value, trusted=False):
+        with self.lock:
+            period = self.periods.get(raw_value)
+            if period is not None:
+                self.periods.move_to_end(raw_value)
+                self.hits += 1
+                if trusted or raw_value not in self.unverified:
+                    return period
+        if period is not None:
+            period.validate(raw_value)
+            with self.lock:
+                self.unverified.discard(raw_value)
+            return period
+        period = make_period(raw_value, trusted)
+        with self.lock:
+            self.misses += 1
+            if self.maxsize != 0:
+                cached = self.periods.setdefault(raw_value, period)
+                if not trusted:
+                    self.unverified.discard(raw_value)
+                elif cached is period:
+                    self.unverified.add(raw_value)
+                period = cached
+                self.trim()
+        return period
+
+    def trim(self):
+        if self.maxsize is not None:
+            while len(self.periods) > self.maxsize:
+                raw_value, _ = self.periods.popitem(last=False)
+                self.unverified.discard(raw_value)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            self.trim()
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "size": len(self.periods),
+        }
+
+    def clear(self):
+        with self.lock:
+            self.periods.clear()
+            self.unverified.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def make_period(raw_value, trusted=False):
+    """
+    build a new (non-interned) Period instance for the given raw value,
+    skipping validation if trusted
+    """
     if raw_value[0] not in PERIOD_PREFIXES:
         raise ValidationError(f"invalid prefix in {raw_value}")
+    if trusted:
+        return PERIOD_PREFIXES[raw_value[0]].trusted(raw_value)
     return PERIOD_PREFIXES[raw_value[0]](raw_value)
 
 
+period_cache = PeriodCache()
+
+
+def get_period(raw_value, trusted=False):
+    """
+    return the shared, immutable Period instance for the given raw value.
+    If trusted, a raw value not yet interned is not validated (until it is
+    next looked up without trusted).
+    """
+    return period_cache.get(raw_value, trusted)
+
+
 def period_for_date(period_type, date=None):
     """
     for the given period_type, returns the period of the given date (or today
@@ -399,9 +824,24 @@ def period_start_end(period):
     return PERIOD_PREFIXES[period[0]].start_end(period)
 
 
+def period_to_ordinal(period):
+    """
+    for the given period, return its integer index within its period type
+    """
+    return PERIOD_PREFIXES[period[0]].to_ordinal(period)
+
+
+def period_from_ordinal(period_type, ordinal):
+    """
+    for the given period_type, return the period with the given integer index
+    """
+    return PERIOD_TYPES[period_type].from_ordinal(ordinal)
+
+
 def period_range(start, stop, inclusive=False):
     """
-    yields the periods from start to (but not including) stop.
+    returns a lazy PeriodRange of the periods from start to (but not
+    including) stop.
 
     For example, period_range("Y-2010", "Y-2013") will yield "Y-2010",
     "Y-2011", "Y-2012".
@@ -411,6 +851,17 @@ def period_range(start, stop, inclusive=False):
     return PERIOD_PREFIXES[start[0]].range(start, stop, inclusive)
 
 
+def period_sort_key(period):
+    """
+    for the given period (raw value or Period), return the int used to sort
+    periods of any type by start date, then end date, then granularity, e.g.
+    sorted(periods, key=period_sort_key)
+    """
+    if not isinstance(period, Period):
+        period = get_period(period)
+    return period.sort_key
+
+
 def period_display(period):
     """
     display the given period in a human-readable form
@@ -418,7 +869,63 @@ def period_display(period):
     return PERIOD_PREFIXES[period[0]].display(period)
 
 
+class IsoCalendar:
+    """
+    precomputed table of ISO week-numbering years from first_year to
+    last_year, holding the week ordinal (see WeeklyPeriod.to_ordinal) of
+    each year's week 1. Years outside the span are computed on the fly.
+    """
+
+    def __init__(self, first_year=ISO_CALENDAR_FIRST_YEAR, last_year=ISO_CALENDAR_LAST_YEAR):
+        self.set_span(first_year, last_year)
+
+    def set_span(self, first_year, last_year):
+        # one extra entry so weeks_in_year works for last_year; built before
+        # any attribute is set, so a failed call leaves the table unchanged
+        week_ones = [
+            self.compute_week_one(year)
+            for year in range(first_year, last_year + 2)
+        ]
+        self.first_year, self.last_year, self.week_ones = first_year, last_year, week_ones
+
+    @staticmethod
+    def compute_week_one(year):
+        if year == datetime.MAXYEAR + 1:
+            # January 4th of a year date cannot represent, needed for the
+            # number of weeks in MAXYEAR
+            fourth_jan = datetime.date(datetime.MAXYEAR, 12, 31).toordinal() + 4
+        else:
+            fourth_jan = datetime.date(year, 1, 4).toordinal()
+        # ordinal 1 (January 1st, year 1) is a Monday
+        return (fourth_jan - (fourth_jan - 1) % 7 - 1) // 7
+
+    def week_one(self, year):
+        if self.first_year <= year <= self.last_year + 1:
+            return self.week_ones[year - self.first_year]
+        return self.compute_week_one(year)
+
+    def weeks_in_year(self, year):
+        return self.week_one(year + 1) - self.week_one(year)
+
+    def week_ordinal(self, year, week):
+        return self.week_one(year) + week - 1
+
+    def year_week(self, ordinal):
+        """
+        the (ISO year, ISO week) of the given week ordinal
+        """
+        index = bisect.bisect_right(self.week_ones, ordinal) - 1
+        if 0 <= index < len(self.week_ones) - 1:
+            return self.first_year + index, ordinal - self.week_ones[index] + 1
+        year, week, _ = datetime.date.fromordinal(ordinal * 7 + 1).isocalendar()
+        return year, week
+
+    def week_start(self, year, week):
+        return datetime.date.fromordinal(self.week_ordinal(year, week) * 7 + 1)
+
+
+iso_calendar = IsoCalendar()
+
+
 def iso_week_to_gregorian(iso_year, iso_week):
-    fourth_jan = datetime.date(iso_year, 1, 4)
-    year_start = fourth_jan - datetime.timedelta(fourth_jan.isoweekday() - 1)
-    return year_start + datetime.timedelta(weeks=iso_week - 1)
+    return iso_calendar.week_start(iso_year, iso_week)
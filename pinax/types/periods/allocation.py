@@ -0,0 +1,82 @@
+"""
+Proportional allocation of weekly values to the months, quarters or years the
+weeks overlap.
+
+Requires numpy (``pip install pinax-types[numpy]``).
+"""
+from django.core.exceptions import ValidationError
+
+import numpy as np
+
+from . import PERIOD_TYPES, PeriodRange, WeeklyPeriod, period_range
+from .arrays import ORDINALS_FOR_DATES, STARTS_FOR_ORDINALS, weekly_starts
+
+
+class AllocationMatrix:
+    """
+    sparse matrix of the days each week in period_range(start, stop,
+    inclusive) shares with each period of the given coarser period type.
+
+    Stored in coordinate form: entry i is the overlap of week rows[i] (an
+    index into weeks) with period columns[i] (an index into targets), in
+    days[i] days. Every week has one entry, or two if it straddles a boundary.
+    """
+
+    def __init__(self, start, stop, period_type, inclusive=False):
+        self.weeks = period_range(start, stop, inclusive)
+        if self.weeks.period_class is not WeeklyPeriod:
+            raise ValidationError("allocation ranges must be weekly")
+        self.period_class = PERIOD_TYPES[period_type]
+        if WeeklyPeriod.prefix not in self.period_class.contains:
+            raise ValidationError(f"weeks cannot be allocated to {period_type} periods")
+        ordinals_for = ORDINALS_FOR_DATES[self.period_class.prefix]
+        starts_for = STARTS_FOR_ORDINALS[self.period_class.prefix]
+
+        first_days = weekly_starts(np.arange(self.weeks.ordinals.start, self.weeks.ordinals.stop))
+        first_targets = ordinals_for(first_days)
+        last_targets = ordinals_for(first_days + np.timedelta64(6, "D"))
+        if len(first_days):
+            self.targets = PeriodRange(self.period_class, range(first_targets[0], last_targets[-1] + 1))
+        else:
+            self.targets = PeriodRange(self.period_class, range(0))
+
+        straddles = first_targets != last_targets
+        # days of each week falling before the start of its last target
+        split = (starts_for(last_targets) - first_days).astype(np.int64)
+        self.rows = np.concatenate([np.arange(len(first_days)), np.flatnonzero(straddles)])
+        self.columns = np.concatenate([first_targets, last_targets[straddles]]) - self.targets.ordinals.start
+        self.days = np.concatenate([np.where(straddles, split, 7), 7 - split[straddles]])
+
+    @property
+    def fractions(self):
+        """
+        the share of each week's days in each entry
+        """
+        return self.days / 7
+
+    @property
+    def shape(self):
+        return len(self.weeks), len(self.targets)
+
+    def to_dense(self, fractions=True):
+        """
+        the full (weeks x targets) matrix of fractions (or of days)
+        """
+        matrix = np.zeros(self.shape)
+        matrix[self.rows, self.columns] = self.fractions if fractions else self.days
+        return matrix
+
+    def allocate(self, weekly_values):
+        """
+        spreads values, one per week (or one row per week for 2-D input), over
+        the target periods by day-weight; returns one value (or row) per target
+        """
+        values = np.asarray(weekly_values, dtype=float)
+        if values.shape[:1] != (len(self.weeks),):
+            raise ValueError(f"expected {len(self.weeks)} weekly values, got {values.shape[:1]}")
+        weighted = values[self.rows] * self.fractions.reshape((-1,) + (1,) * (values.ndim - 1))
+        if values.ndim == 1:
+            return np.bincount(self.columns, weights=weighted, minlength=len(self.targets))
+        result = np.zeros((len(self.targets),) + values.shape[1:])
+        np.add.at(result, self.columns, weighted)
+        return result
@@ -0,0 +1,121 @@
+"""
+NumPy-backed batch versions of the period helpers.
+
+Requires numpy (``pip install pinax-types[numpy]``).
+"""
+import datetime
+
+from django.core.exceptions import ValidationError
+
+import numpy as np
+
+from . import PERIOD_PREFIXES, PERIOD_TYPES
+
+# date ordinal (as in datetime.date.toordinal) of the datetime64 epoch
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def weekly_ordinals(dates):
+    days = dates.astype(np.int64)
+    return (days + (EPOCH_ORDINAL - 1)) // 7
+
+
+def monthly_ordinals(dates):
+    return dates.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+
+
+def quarterly_ordinals(dates):
+    return monthly_ordinals(dates) // 3
+
+
+def yearly_ordinals(dates):
+    return dates.astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+ORDINALS_FOR_DATES = {
+    "W": weekly_ordinals,
+    "M": monthly_ordinals,
+    "Q": quarterly_ordinals,
+    "Y": yearly_ordinals,
+}
+
+
+def weekly_starts(ordinals):
+    return (ordinals * 7 + (1 - EPOCH_ORDINAL)).astype("datetime64[D]")
+
+
+def monthly_starts(ordinals):
+    return (ordinals - 1970 * 12).astype("datetime64[M]").astype("datetime64[D]")
+
+
+def quarterly_starts(ordinals):
+    return monthly_starts(ordinals * 3)
+
+
+def yearly_starts(ordinals):
+    return (ordinals - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+
+
+STARTS_FOR_ORDINALS = {
+    "W": weekly_starts,
+    "M": monthly_starts,
+    "Q": quarterly_starts,
+    "Y": yearly_starts,
+}
+
+
+def as_dates(dates):
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    if np.isnat(dates).any():
+        raise ValidationError("dates must not contain NaT")
+    return dates
+
+
+def ordinals_to_periods(period_class, ordinals):
+    """
+    convert an array of ordinals of the given period class to an array of raw
+    periods, formatting each distinct ordinal only once
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    unique, inverse = np.unique(ordinals, return_inverse=True)
+    raws = np.array([period_class.from_ordinal(int(ordinal)) for ordinal in unique], dtype=str)
+    return raws[inverse].reshape(ordinals.shape)
+
+
+def periods_for_dates(period_type, dates, ordinals=False):
+    """
+    vectorized period_for_date: for the given period_type, returns an array of
+    the raw periods (or, with ordinals=True, the period ordinals) of each date
+    in an array of datetime64 values (or anything numpy can convert to one)
+    """
+    period_class = PERIOD_TYPES[period_type]
+    result = ORDINALS_FOR_DATES[period_class.prefix](as_dates(dates))
+    if ordinals:
+        return result
+    return ordinals_to_periods(period_class, result)
+
+
+def period_start_end_many(periods):
+    """
+    vectorized period_start_end: for an array of raw periods (of any mix of
+    period types) returns a tuple of two datetime64[D] arrays holding the
+    start and end date of each period
+    """
+    periods = np.asarray(periods, dtype=str)
+    unique, inverse = np.unique(periods, return_inverse=True)
+    ordinals = np.empty(len(unique), dtype=np.int64)
+    for i, raw in enumerate(unique):
+        period_class = PERIOD_PREFIXES.get(raw[:1])
+        if period_class is None:
+            raise ValidationError(f"invalid prefix in {raw}")
+        period_class.validate(raw)
+        ordinals[i] = period_class.to_ordinal(raw)
+    prefixes = unique.astype("U1")
+    starts = np.empty(len(unique), dtype="datetime64[D]")
+    ends = np.empty(len(unique), dtype="datetime64[D]")
+    for prefix, starts_for in STARTS_FOR_ORDINALS.items():
+        mask = prefixes == prefix
+        if mask.any():
+            starts[mask] = starts_for(ordinals[mask])
+            ends[mask] = starts_for(ordinals[mask] + 1) - np.timedelta64(1, "D")
+    return starts[inverse].reshape(periods.shape), ends[inverse].reshape(periods.shape)
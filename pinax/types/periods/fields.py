@@ -1,8 +1,11 @@
 from django import forms
+from django.conf import settings
 from django.db import models
 from django.forms.utils import ValidationError
+from django.utils.functional import SimpleLazyObject
 
-from . import Period, get_period, parse
+from . import PERIOD_PREFIXES, Period, get_period, parse
+from .lookups import PERIOD_LOOKUPS
 
 
 class PeriodFormField(forms.CharField):
@@ -23,6 +26,21 @@ class PeriodFormField(forms.CharField):
         return parsed_value
 
 
+PERIOD_HELP_TEXT = "Enter a weekly, monthly, quarterly, or yearly period (e.g. 2015-W03, Jan 2015, 1/2015, January 2015, 2015Q1, 2015)"  # noqa
+
+
+def trusted_period(value, expression, connection):
+    if not value:
+        return value
+    return get_period(value, trusted=True)
+
+
+def deferred_period(value, expression, connection):
+    if not value:
+        return value
+    return SimpleLazyObject(lambda: get_period(value, trusted=True))
+
+
 class PeriodField(models.CharField):
 
     description = "A valid period from pinax-types"
@@ -41,6 +59,19 @@ class PeriodField(models.CharField):
             return value
         return get_period(value)
 
+    def get_db_converters(self, connection):
+        """
+        values were validated when written, so by default they are loaded
+        without validation, optionally deferring building each Period until
+        first use. Set PINAX_TYPES_PERIOD_FIELD_STRICT for data that may not
+        have been (e.g. legacy rows written by other code).
+        """
+        if getattr(settings, "PINAX_TYPES_PERIOD_FIELD_STRICT", False):
+            return [self.from_db_value]
+        if getattr(settings, "PINAX_TYPES_PERIOD_FIELD_DEFERRED", False):
+            return [deferred_period]
+        return [trusted_period]
+
     def to_python(self, value):
         if isinstance(value, Period) or not value:
             return value
@@ -54,6 +85,9 @@ class PeriodField(models.CharField):
 
     def clean(self, value, model_instance):
         value = self.to_python(value)
+        if isinstance(value, Period):
+            # a strict lookup, so periods loaded without validation are checked
+            value = get_period(value.raw_value)
         self.validate(value, model_instance)
         self.run_validators(value.raw_value)
         return value
@@ -68,7 +102,103 @@ class PeriodField(models.CharField):
     def formfield(self, **kwargs):
         defaults = {
             "form_class": PeriodFormField,
-            "help_text": "Enter a weekly, monthly, quarterly, or yearly period (e.g. 2015-W03, Jan 2015, 1/2015, January 2015, 2015Q1, 2015)"  # noqa
+            "help_text": PERIOD_HELP_TEXT,
         }
         defaults.update(kwargs)
         return super().formfield(**defaults)
+
+    def period_type_bounds(self, period_class):
+        """
+        the half-open range of stored values holding periods of the given type
+        """
+        return f"{period_class.prefix}-", f"{period_class.prefix}."
+
+
+# period type codes for the high bits of a packed period, coarsest first
+PERIOD_ORDINAL_CODES = {
+    "Y": 1,
+    "Q": 2,
+    "M": 3,
+    "W": 4,
+}
+
+PERIOD_ORDINAL_PREFIXES = {code: prefix for prefix, code in PERIOD_ORDINAL_CODES.items()}
+
+PERIOD_ORDINAL_BITS = 32
+
+
+def pack_period(period):
+    """
+    the integer holding a period's type code in its high bits and the
+    period's ordinal in its low bits
+    """
+    if not isinstance(period, Period):
+        period = get_period(period)
+    return (PERIOD_ORDINAL_CODES[period.prefix] << PERIOD_ORDINAL_BITS) | period.ordinal
+
+
+def unpack_period(value):
+    """
+    the (interned) Period packed into the given integer by pack_period
+    """
+    prefix = PERIOD_ORDINAL_PREFIXES[value >> PERIOD_ORDINAL_BITS]
+    ordinal = value & ((1 << PERIOD_ORDINAL_BITS) - 1)
+    return get_period(PERIOD_PREFIXES[prefix].from_ordinal(ordinal), trusted=True)
+
+
+class PeriodOrdinalField(models.BigIntegerField):
+    """
+    a period stored as a packed integer (see pack_period) rather than a raw
+    string, for narrower indexes. Values order by period type (yearly first)
+    and then chronologically, and the period lookups compile to integer ranges.
+    """
+
+    description = "A valid period from pinax-types, stored as an integer"
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return unpack_period(value)
+
+    def to_python(self, value):
+        if isinstance(value, Period) or not value:
+            return value
+        if isinstance(value, int):
+            return unpack_period(value)
+        return get_period(value)
+
+    def get_prep_value(self, value):
+        if isinstance(value, (Period, str)):
+            return pack_period(value) if value else None
+        return super().get_prep_value(value)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return "" if value is None else str(value)
+
+    def clean(self, value, model_instance):
+        value = self.to_python(value)
+        self.validate(value, model_instance)
+        self.run_validators(self.get_prep_value(value))
+        return value
+
+    def formfield(self, **kwargs):
+        defaults = {
+            "form_class": PeriodFormField,
+            "help_text": PERIOD_HELP_TEXT,
+        }
+        defaults.update(kwargs)
+        # skip IntegerField's min_value and max_value
+        return models.Field.formfield(self, **defaults)
+
+    def period_type_bounds(self, period_class):
+        """
+        the half-open range of stored values holding periods of the given type
+        """
+        code = PERIOD_ORDINAL_CODES[period_class.prefix]
+        return code << PERIOD_ORDINAL_BITS, (code + 1) << PERIOD_ORDINAL_BITS
+
+
+for lookup in PERIOD_LOOKUPS:
+    PeriodField.register_lookup(lookup)
+    PeriodOrdinalField.register_lookup(lookup)
@@ -0,0 +1,191 @@
+"""
+Database functions computing periods in SQL, so rows can be grouped or
+filtered by period without loading them into Python:
+
+* TruncPeriod("created", "weekly"): the raw period of the given type
+  containing a date or datetime column, e.g. to group by with
+  .values(period=TruncPeriod("created", "monthly")).annotate(Sum("value"))
+* PeriodStart("period") and PeriodEnd("period"): the first and last dates of
+  the periods stored in a period column, for filtering, ordering or joining
+  against dates
+
+Implemented for SQLite, PostgreSQL and MySQL.
+"""
+from django.db import NotSupportedError
+from django.db.models import DateField, DateTimeField, Func
+from django.db.models.functions import TruncDate
+
+from . import PERIOD_TYPES
+from .fields import PeriodField
+
+# ISO weeks belong to the year of their Thursday, and are numbered from the
+# week holding that year's first Thursday
+TRUNC_PERIOD_SQL = {
+    "sqlite": {
+        "W": (
+            "'W-' || strftime('%%Y', date({expression}, '-3 days', 'weekday 4')) || '-' || "
+            "printf('%%02d', (strftime('%%j', date({expression}, '-3 days', 'weekday 4')) - 1) / 7 + 1)"
+        ),
+        "M": "'M-' || strftime('%%Y-%%m', {expression})",
+        "Q": (
+            "'Q-' || strftime('%%Y', {expression}) || '-' || "
+            "((CAST(strftime('%%m', {expression}) AS INTEGER) + 2) / 3)"
+        ),
+        "Y": "'Y-' || strftime('%%Y', {expression})",
+    },
+    "postgresql": {
+        "W": "to_char({expression}, '\"W-\"IYYY-IW')",
+        "M": "to_char({expression}, '\"M-\"YYYY-MM')",
+        "Q": "to_char({expression}, '\"Q-\"YYYY-Q')",
+        "Y": "to_char({expression}, '\"Y-\"YYYY')",
+    },
+    "mysql": {
+        "W": "CONCAT('W-', LEFT(YEARWEEK({expression}, 3), 4), '-', RIGHT(YEARWEEK({expression}, 3), 2))",
+        "M": "DATE_FORMAT({expression}, 'M-%%Y-%%m')",
+        "Q": "CONCAT('Q-', YEAR({expression}), '-', QUARTER({expression}))",
+        "Y": "CONCAT('Y-', YEAR({expression}))",
+    },
+}
+
+# the first day of a stored raw period, by period type
+PERIOD_START_SQL = {
+    "sqlite": {
+        "W": (
+            "date(substr({expression}, 3, 4) || '-01-04', '-6 days', 'weekday 1', "
+            "'+' || ((CAST(substr({expression}, 8, 2) AS INTEGER) - 1) * 7) || ' days')"
+        ),
+        "M": "date(substr({expression}, 3, 7) || '-01')",
+        "Q": (
+            "date(substr({expression}, 3, 4) || '-' || "
+            "printf('%%02d', (CAST(substr({expression}, 8, 1) AS INTEGER) - 1) * 3 + 1) || '-01')"
+        ),
+        "Y": "date(substr({expression}, 3, 4) || '-01-01')",
+    },
+    "postgresql": {
+        "W": "to_date(substr({expression}, 3), 'IYYY-IW')",
+        "M": "to_date(substr({expression}, 3), 'YYYY-MM')",
+        "Q": (
+            "make_date(substr({expression}, 3, 4)::integer, "
+            "(substr({expression}, 8, 1)::integer - 1) * 3 + 1, 1)"
+        ),
+        "Y": "make_date(substr({expression}, 3, 4)::integer, 1, 1)",
+    },
+    "mysql": {
+        "W": "STR_TO_DATE(CONCAT(SUBSTR({expression}, 3, 4), ' ', SUBSTR({expression}, 8, 2), ' Monday'), '%%x %%v %%W')",
+        "M": "STR_TO_DATE(CONCAT(SUBSTR({expression}, 3, 7), '-01'), '%%Y-%%m-%%d')",
+        "Q": "MAKEDATE(SUBSTR({expression}, 3, 4), 1) + INTERVAL (SUBSTR({expression}, 8, 1) - 1) QUARTER",
+        "Y": "MAKEDATE(SUBSTR({expression}, 3, 4), 1)",
+    },
+}
+
+# the last day of a stored raw period, in terms of its first day, {start}
+PERIOD_END_SQL = {
+    "sqlite": {
+        "W": "date({start}, '+6 days')",
+        "M": "date({start}, '+1 month', '-1 day')",
+        "Q": "date({start}, '+3 months', '-1 day')",
+        "Y": "date({start}, '+1 year', '-1 day')",
+    },
+    "postgresql": {
+        "W": "({start} + 6)",
+        "M": "(({start}) + interval '1 month' - interval '1 day')::date",
+        "Q": "(({start}) + interval '3 months' - interval '1 day')::date",
+        "Y": "(({start}) + interval '1 year' - interval '1 day')::date",
+    },
+    "mysql": {
+        "W": "({start} + INTERVAL 6 DAY)",
+        "M": "LAST_DAY({start})",
+        "Q": "({start} + INTERVAL 1 QUARTER - INTERVAL 1 DAY)",
+        "Y": "({start} + INTERVAL 1 YEAR - INTERVAL 1 DAY)",
+    },
+}
+
+
+def period_case(templates):
+    """
+    SQL choosing among per period type templates by the prefix of the
+    stored raw period
+    """
+    whens = " ".join(
+        f"WHEN '{prefix}' THEN {template}" for prefix, template in templates.items()
+    )
+    return f"CASE SUBSTR({{expression}}, 1, 1) {whens} END"
+
+
+class PeriodFunc(Func):
+    """
+    base class for functions of one expression rendered from a per-vendor
+    SQL template, in which {expression} stands for the compiled expression
+    (and may appear more than once)
+    """
+
+    arity = 1
+
+    def template_for(self, connection):
+        raise NotImplementedError
+
+    def compile_source(self, compiler, connection):
+        return compiler.compile(self.source_expressions[0])
+
+    def as_sql(self, compiler, connection, **extra_context):
+        template = self.template_for(connection)
+        if template is None:
+            raise NotSupportedError(
+                f"{self.__class__.__name__} is not supported on {connection.vendor}"
+            )
+        sql, params = self.compile_source(compiler, connection)
+        return template.format(expression=sql), list(params) * template.count("{expression}")
+
+
+class TruncPeriod(PeriodFunc):
+    """
+    the raw period of the given period_type containing a date or datetime
+    expression; the same period WeeklyPeriod.for_date (and so on) would give.
+    Datetimes are first converted to dates in the current time zone.
+    """
+
+    def __init__(self, expression, period_type, **extra):
+        self.period_class = PERIOD_TYPES[period_type]
+        super().__init__(expression, output_field=PeriodField(), **extra)
+
+    def template_for(self, connection):
+        return TRUNC_PERIOD_SQL.get(connection.vendor, {}).get(self.period_class.prefix)
+
+    def compile_source(self, compiler, connection):
+        source = self.source_expressions[0]
+        if isinstance(source.output_field, DateTimeField):
+            source = TruncDate(source)
+        return compiler.compile(source)
+
+
+class PeriodStart(PeriodFunc):
+    """
+    the first date of the period stored in a period column (the start of
+    Period.get_start_end())
+    """
+
+    output_field = DateField()
+
+    def template_for(self, connection):
+        starts = PERIOD_START_SQL.get(connection.vendor)
+        if starts is None:
+            return None
+        return period_case(starts)
+
+
+class PeriodEnd(PeriodFunc):
+    """
+    the last date of the period stored in a period column (the end of
+    Period.get_start_end())
+    """
+
+    output_field = DateField()
+
+    def template_for(self, connection):
+        starts, ends = PERIOD_START_SQL.get(connection.vendor), PERIOD_END_SQL.get(connection.vendor)
+        if starts is None:
+            return None
+        return period_case({
+            prefix: ends[prefix].replace("{start}", start)
+            for prefix, start in starts.items()
+        })
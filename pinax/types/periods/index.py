@@ -0,0 +1,122 @@
+import bisect
+import datetime
+
+from . import PERIOD_PREFIXES, Period, get_period
+
+
+def as_date(value):
+    """
+    accepts a datetime.date, datetime.datetime or ISO "YYYY-MM-DD" string
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+class PeriodIndex:
+    """
+    a set of periods of any types answering which of them contain a date,
+    overlap a date range, lie within a date range or contain a date range.
+
+    Periods of one type never overlap each other, so the index keeps a sorted
+    list of ordinals per period type and answers each query with a bisect
+    into every list: O(log n + k) for k results. Inserts and deletes keep the
+    lists sorted.
+    """
+
+    def __init__(self, periods=()):
+        ordinals = {prefix: set() for prefix in PERIOD_PREFIXES}
+        for period in periods:
+            period = self.as_period(period)
+            ordinals[period.prefix].add(period.ordinal)
+        self.ordinals = {prefix: sorted(values) for prefix, values in ordinals.items()}
+
+    @staticmethod
+    def as_period(period):
+        if isinstance(period, Period):
+            return period
+        return get_period(period)
+
+    def __len__(self):
+        return sum(len(ordinals) for ordinals in self.ordinals.values())
+
+    def __iter__(self):
+        for prefix, ordinals in self.ordinals.items():
+            yield from self.periods(prefix, ordinals)
+
+    def __contains__(self, period):
+        period = self.as_period(period)
+        ordinals = self.ordinals[period.prefix]
+        position = bisect.bisect_left(ordinals, period.ordinal)
+        return position < len(ordinals) and ordinals[position] == period.ordinal
+
+    def add(self, period):
+        period = self.as_period(period)
+        if period not in self:
+            bisect.insort(self.ordinals[period.prefix], period.ordinal)
+
+    def discard(self, period):
+        period = self.as_period(period)
+        if period in self:
+            ordinals = self.ordinals[period.prefix]
+            del ordinals[bisect.bisect_left(ordinals, period.ordinal)]
+
+    def remove(self, period):
+        if period not in self:
+            raise KeyError(period)
+        self.discard(period)
+
+    @staticmethod
+    def periods(prefix, ordinals):
+        from_ordinal = PERIOD_PREFIXES[prefix].from_ordinal
+        return [get_period(from_ordinal(ordinal)) for ordinal in ordinals]
+
+    def between(self, prefix, period_range):
+        """
+        the indexed periods of the given type whose ordinals fall in the given
+        PeriodRange
+        """
+        ordinals = self.ordinals[prefix]
+        low = bisect.bisect_left(ordinals, period_range.ordinals.start)
+        high = bisect.bisect_left(ordinals, period_range.ordinals.stop, low)
+        return self.periods(prefix, ordinals[low:high])
+
+    def query(self, method, start, end):
+        """
+        the indexed periods in the PeriodRange returned, for each period type,
+        by the named Period class method for start and end
+        """
+        start, end = as_date(start), as_date(end)
+        results = []
+        for prefix, period_class in PERIOD_PREFIXES.items():
+            results.extend(self.between(prefix, getattr(period_class, method)(start, end)))
+        return results
+
+    def at(self, date):
+        """
+        the indexed periods containing the given date
+        """
+        return self.overlapping(date, date)
+
+    def overlapping(self, start, end):
+        """
+        the indexed periods sharing at least one day with start to end
+        """
+        return self.query("overlapping", start, end)
+
+    def within(self, start, end):
+        """
+        the indexed periods lying entirely within start to end
+        """
+        return self.query("within", start, end)
+
+    def containing(self, start, end):
+        """
+        the indexed periods containing all of start to end
+        """
+        return [
+            period for period in self.overlapping(start, start)
+            if period.end >= as_date(end)
+        ]
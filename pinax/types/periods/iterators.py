@@ -0,0 +1,70 @@
+"""
+Streaming a queryset keyed by a period field, one bounded query per chunk of
+periods rather than loading everything or paginating with OFFSET.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from . import get_period, period_range
+
+
+def fetch_chunk(queryset, field_name, chunk):
+    """
+    the rows of queryset whose field_name holds one of the periods in the
+    PeriodRange chunk, in period then pk order
+    """
+    stop = chunk.period_class.from_ordinal(chunk.ordinals.stop)
+    rows = queryset.filter(**{f"{field_name}__range_periods": (chunk[0], stop)})
+    return list(rows.order_by(field_name, "pk"))
+
+
+def split_chunk(field_name, chunk, rows):
+    """
+    (Period, rows) for each period in chunk, including those with no rows
+    """
+    rows_by_period = {raw: [] for raw in chunk}
+    for row in rows:
+        value = row[field_name] if isinstance(row, dict) else getattr(row, field_name)
+        rows_by_period[str(value)].append(row)
+    for raw, period_rows in rows_by_period.items():
+        yield get_period(raw), period_rows
+
+
+def close_connection(using):
+    connections[using].close()
+
+
+def iter_period_chunks(queryset, field_name, start, stop, inclusive=False, periods_per_chunk=1, prefetch=False):
+    """
+    yields (Period, rows) for every period in period_range(start, stop,
+    inclusive), where rows are the model instances (or values() dicts) of
+    queryset whose field_name holds that period, in pk order.
+
+    Rows are fetched with one query per periods_per_chunk periods, so at most
+    that many periods' rows are held at once. With prefetch, the next chunk
+    is fetched on a worker thread (with its own database connection) while
+    the current one is processed; it cannot see uncommitted changes made in
+    the calling thread's transaction.
+    """
+    periods = period_range(str(start), str(stop), inclusive)
+    chunks = (
+        periods[position:position + periods_per_chunk]
+        for position in range(0, len(periods), periods_per_chunk)
+    )
+    if not prefetch:
+        for chunk in chunks:
+            yield from split_chunk(field_name, chunk, fetch_chunk(queryset, field_name, chunk))
+        return
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            pending = None
+            for chunk in chunks:
+                future = executor.submit(fetch_chunk, queryset, field_name, chunk)
+                if pending is not None:
+                    yield from split_chunk(field_name, pending[0], pending[1].result())
+                pending = chunk, future
+            if pending is not None:
+                yield from split_chunk(field_name, pending[0], pending[1].result())
+        finally:
+            executor.submit(close_connection, queryset.db)
@@ -0,0 +1,104 @@
+"""
+Lookups for period model fields that compile to range predicates on the
+stored value, so a B-tree index on the column can serve them:
+
+* period__within="Y-2015": periods included by Y-2015 (see Period.includes)
+* period__overlaps=("2015-03-01", "2015-06-30"): periods sharing a day with
+  the given dates
+* period__type="monthly": periods of the given type
+* period__range_periods=("M-2015-01", "M-2015-07"): periods from start to
+  (but not including) stop, like period_range
+"""
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import Lookup
+
+from . import PERIOD_PREFIXES, PERIOD_TYPES, get_period
+from .index import as_date
+
+
+class PeriodRangesLookup(Lookup):
+    """
+    base class for lookups matching any of a list of inclusive (low, high)
+    raw period bounds, each of a single period type
+    """
+
+    prepare_rhs = False
+
+    def bounds(self):
+        raise NotImplementedError
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        prep = self.lhs.output_field.get_prep_value
+        clauses, params = [], []
+        for low, high in self.bounds():
+            if low == high:
+                clauses.append(f"{lhs} = %s")
+                params.extend([*lhs_params, prep(low)])
+            else:
+                clauses.append(f"{lhs} BETWEEN %s AND %s")
+                params.extend([*lhs_params, prep(low), prep(high)])
+        if not clauses:
+            raise EmptyResultSet
+        return "({})".format(" OR ".join(clauses)), params
+
+
+def range_bounds(period_range):
+    if len(period_range):
+        return [(period_range[0], period_range[-1])]
+    return []
+
+
+class Within(PeriodRangesLookup):
+
+    lookup_name = "within"
+
+    def bounds(self):
+        period = get_period(str(self.rhs))
+        bounds = [(period.raw_value, period.raw_value)]
+        start, end = period.get_start_end()
+        for prefix in period.contains:
+            bounds.extend(range_bounds(PERIOD_PREFIXES[prefix].within(start, end)))
+        return bounds
+
+
+class Overlaps(PeriodRangesLookup):
+
+    lookup_name = "overlaps"
+
+    def bounds(self):
+        start, end = (as_date(value) for value in self.rhs)
+        bounds = []
+        for period_class in PERIOD_PREFIXES.values():
+            bounds.extend(range_bounds(period_class.overlapping(start, end)))
+        return bounds
+
+
+class RangePeriods(PeriodRangesLookup):
+
+    lookup_name = "range_periods"
+
+    def bounds(self):
+        start, stop = (str(value) for value in self.rhs)
+        if start[:1] != stop[:1]:
+            raise ValidationError("start and stop must be of same period type")
+        period_class = get_period(start).__class__
+        return range_bounds(period_class.range(start, stop))
+
+
+class OfType(Lookup):
+
+    lookup_name = "type"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        if self.rhs not in PERIOD_TYPES:
+            raise ValidationError(
+                f"invalid period type: {self.rhs} (expected one of {', '.join(PERIOD_TYPES)})"
+            )
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        low, high = self.lhs.output_field.period_type_bounds(PERIOD_TYPES[self.rhs])
+        return f"{lhs} >= %s AND {lhs} < %s", [*lhs_params, low, *lhs_params, high]
+
+
+PERIOD_LOOKUPS = [Within, Overlaps, RangePeriods, OfType]
@@ -0,0 +1,62 @@
+"""
+Migration operations for period model fields.
+"""
+from django.db import migrations
+
+DEFAULT_COPY_BATCH_SIZE = 1000
+
+
+def copy_periods(model, from_field, to_field, using, batch_size=DEFAULT_COPY_BATCH_SIZE):
+    """
+    copies the periods in one field of every row of model into another,
+    in batches of batch_size rows
+    """
+    queryset = model._default_manager.using(using).only("pk", from_field).order_by("pk")
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        setattr(obj, to_field, getattr(obj, from_field))
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model._default_manager.using(using).bulk_update(batch, [to_field])
+            batch = []
+    if batch:
+        model._default_manager.using(using).bulk_update(batch, [to_field])
+
+
+class CopyPeriods(migrations.RunPython):
+    """
+    a reversible operation copying the periods in from_field into to_field
+    of every row of a model, e.g. from a PeriodField into a
+    PeriodOrdinalField added next to it. Reversing copies them back.
+    """
+
+    def __init__(self, app_label, model_name, from_field, to_field, batch_size=DEFAULT_COPY_BATCH_SIZE):
+        self.app_label = app_label
+        self.model_name = model_name
+        self.from_field = from_field
+        self.to_field = to_field
+        self.batch_size = batch_size
+        super().__init__(self.forwards, self.backwards)
+
+    def deconstruct(self):
+        kwargs = {}
+        if self.batch_size != DEFAULT_COPY_BATCH_SIZE:
+            kwargs["batch_size"] = self.batch_size
+        return (
+            self.__class__.__name__,
+            [self.app_label, self.model_name, self.from_field, self.to_field],
+            kwargs,
+        )
+
+    def copy(self, apps, schema_editor, from_field, to_field):
+        model = apps.get_model(self.app_label, self.model_name)
+        copy_periods(model, from_field, to_field, schema_editor.connection.alias, self.batch_size)
+
+    def forwards(self, apps, schema_editor):
+        self.copy(apps, schema_editor, self.from_field, self.to_field)
+
+    def backwards(self, apps, schema_editor):
+        self.copy(apps, schema_editor, self.to_field, self.from_field)
+
+    def describe(self):
+        return f"Copy periods from {self.model_name}.{self.from_field} to {self.to_field}"
@@ -0,0 +1,143 @@
+import decimal
+
+from django.core.exceptions import ValidationError
+
+from ..values import (
+    VALUE_TYPES,
+    BooleanValueType,
+    DecimalValueType,
+    IntegerValueType,
+    TrafficLightValueType,
+)
+from . import PERIOD_TYPES, get_period
+
+
+class Aggregate:
+    """
+    running count, sum, minimum and maximum of the values rolled up into one
+    period
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self, value):
+        self.count = 1
+        self.total = value
+        self.minimum = value
+        self.maximum = value
+
+    def __repr__(self):
+        return f"<Aggregate: count={self.count} total={self.total} min={self.minimum} max={self.maximum}>"
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+
+def to_decimal(value):
+    if isinstance(value, float):
+        value = repr(value)
+    return decimal.Decimal(value)
+
+
+def to_boolean(value):
+    if not isinstance(value, bool):
+        BooleanValueType.validate(value)
+    return int(value is True or value == "true")
+
+
+def validated(value_type, convert):
+    """
+    returns a function applying convert to values the given value type's
+    validate accepts, raising ValidationError for any other value
+    """
+    value_type_class = VALUE_TYPES[value_type]
+
+    def coerce(value):
+        try:
+            value_type_class.validate(value)
+        except TypeError:
+            raise ValidationError(f"Incorrect {value_type} value: {value}")
+        return convert(value)
+    return coerce
+
+
+def coercer(value_type=None):
+    """
+    returns the function validating and converting incoming values for the
+    given value type: exact decimal.Decimal accumulation for the
+    Decimal-based types (decimal, monetary, hours, percentage), int for
+    integer, traffic-light and boolean values and fast float accumulation
+    when no value type is given
+    """
+    if value_type is None:
+        return float
+    value_type_class = VALUE_TYPES[value_type]
+    if issubclass(value_type_class, DecimalValueType):
+        return validated(value_type, to_decimal)
+    if issubclass(value_type_class, (IntegerValueType, TrafficLightValueType)):
+        return validated(value_type, int)
+    if issubclass(value_type_class, BooleanValueType):
+        return to_boolean
+    return validated(value_type, float)
+
+
+def rollup_targets(period, prefixes=None):
+    """
+    the raw values of the period itself and of every coarser period (as
+    allowed by the contains hierarchy) that includes it, optionally limited
+    to the given period type prefixes
+    """
+    period = get_period(str(period))
+    targets = []
+    if prefixes is None or period.prefix in prefixes:
+        targets.append(period.raw_value)
+    start, end = period.get_start_end()
+    for period_class in PERIOD_TYPES.values():
+        if period.prefix not in period_class.contains:
+            continue
+        if prefixes is not None and period_class.prefix not in prefixes:
+            continue
+        ordinal = period_class.ordinal_for_date(start)
+        if ordinal == period_class.ordinal_for_date(end):
+            targets.append(period_class.from_ordinal(ordinal))
+    return tuple(targets)
+
+
+def rollup(pairs, value_type=None, levels=None):
+    """
+    aggregates a stream of (period, value) pairs in a single pass, both at
+    each pair's own period and at every coarser period that includes it (a
+    week straddling two months is not included in either, as with
+    Period.includes).
+
+    Returns a dict mapping raw periods to Aggregate instances. levels is an
+    optional list of period type names (e.g. ["quarterly", "yearly"]) to
+    limit the output to.
+    """
+    coerce = coercer(value_type)
+    prefixes = None
+    if levels is not None:
+        prefixes = {PERIOD_TYPES[level].prefix for level in levels}
+    targets_for = {}
+    aggregates = {}
+    for period, value in pairs:
+        targets = targets_for.get(period)
+        if targets is None:
+            targets = targets_for[period] = rollup_targets(period, prefixes)
+        value = coerce(value)
+        for target in targets:
+            aggregate = aggregates.get(target)
+            if aggregate is None:
+                aggregates[target] = Aggregate(value)
+            else:
+                aggregate.add(value)
+    return aggregates
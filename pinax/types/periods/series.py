@@ -0,0 +1,187 @@
+"""
+A compact, array-backed series of values keyed by periods of one type.
+
+Requires numpy (``pip install pinax-types[numpy]``).
+"""
+import operator
+
+from django.core.exceptions import ValidationError
+
+import numpy as np
+
+from . import PERIOD_TYPES, PeriodRange, WeeklyPeriod, get_period
+from .allocation import AllocationMatrix
+
+# months per period, used to map month and quarter ordinals to coarser ones
+MONTHS = {
+    "M": 1,
+    "Q": 3,
+    "Y": 12,
+}
+
+
+class PeriodSeries:
+    """
+    values for a contiguous range of periods of one type, starting at the
+    given period, held in a numpy array indexed by period ordinal.
+
+    Series of the same period type can be combined with + - * / even if they
+    cover different ranges: the result covers both and is NaN wherever either
+    side has no value.
+    """
+
+    def __init__(self, start, values, dtype=float):
+        period = get_period(str(start))
+        self.period_class = type(period)
+        self.start = period.ordinal
+        self.values = np.asarray(values, dtype=dtype).reshape(-1)
+
+    @classmethod
+    def from_dict(cls, data, dtype=float, fill=np.nan):
+        """
+        build a series from a dict of periods (raw values or Periods, all of
+        one type) to values, filling gaps with fill
+        """
+        periods = {get_period(str(period)): value for period, value in data.items()}
+        if not periods:
+            raise ValidationError("cannot build a series from no periods")
+        if len({type(period) for period in periods}) > 1:
+            raise ValidationError("series periods must all be of the same type")
+        first = min(periods)
+        values = np.full(max(periods) - first + 1, fill, dtype=dtype)
+        for period, value in periods.items():
+            values[period - first] = value
+        return cls(first, values, dtype=dtype)
+
+    def __repr__(self):
+        return f"<PeriodSeries: {self.period_class.__name__} x {len(self)}>"
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def stop(self):
+        return self.start + len(self.values)
+
+    @property
+    def index(self):
+        return PeriodRange(self.period_class, range(self.start, self.stop))
+
+    def position(self, period):
+        ordinal = self.index.ordinal_of(period)
+        if ordinal is None or not self.start <= ordinal < self.stop:
+            raise KeyError(period)
+        return ordinal - self.start
+
+    def __getitem__(self, period):
+        return self.values[self.position(period)]
+
+    def __setitem__(self, period, value):
+        self.values[self.position(period)] = value
+
+    def __contains__(self, period):
+        ordinal = self.index.ordinal_of(period)
+        return ordinal is not None and self.start <= ordinal < self.stop
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def get(self, period, default=None):
+        try:
+            return self[period]
+        except KeyError:
+            return default
+
+    def items(self):
+        return zip(self.index, self.values.tolist())
+
+    def values_between(self, start, stop, fill=np.nan):
+        """
+        the values for the ordinals start to (but not including) stop, with
+        fill where this series has none
+        """
+        values = np.full(stop - start, fill, dtype=np.result_type(self.values, fill))
+        low, high = max(start, self.start), min(stop, self.stop)
+        if low < high:
+            values[low - start:high - start] = self.values[low - self.start:high - self.start]
+        return values
+
+    def reindex(self, periods, fill=np.nan):
+        """
+        a new series covering the given PeriodRange (e.g. from period_range),
+        with fill for the periods this series has no value for
+        """
+        if periods.period_class is not self.period_class:
+            raise ValidationError("cannot reindex onto a different period type")
+        if periods.ordinals.step != 1:
+            raise ValidationError("cannot reindex onto a stepped range")
+        start, stop = periods.ordinals.start, max(periods.ordinals.stop, periods.ordinals.start)
+        return self.at_ordinal(start, self.values_between(start, stop, fill))
+
+    def at_ordinal(self, ordinal, values):
+        return PeriodSeries(self.period_class.from_ordinal(ordinal), values, dtype=values.dtype)
+
+    def combine(self, other, op):
+        if not isinstance(other, PeriodSeries):
+            return self.at_ordinal(self.start, op(self.values, other))
+        if other.period_class is not self.period_class:
+            raise ValidationError("cannot combine series of different period types")
+        start, stop = min(self.start, other.start), max(self.stop, other.stop)
+        return self.at_ordinal(
+            start,
+            op(self.values_between(start, stop), other.values_between(start, stop))
+        )
+
+    def __add__(self, other):
+        return self.combine(other, operator.add)
+
+    def __radd__(self, other):
+        return self.combine(other, lambda left, right: right + left)
+
+    def __sub__(self, other):
+        return self.combine(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self.combine(other, lambda left, right: right - left)
+
+    def __mul__(self, other):
+        return self.combine(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self.combine(other, lambda left, right: right * left)
+
+    def __truediv__(self, other):
+        return self.combine(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self.combine(other, lambda left, right: right / left)
+
+    def resample(self, period_type, how="sum"):
+        """
+        a new series of the given coarser period type (one whose contains
+        includes this series' type) holding the sum or mean of the values
+        falling in each period. Weekly values are split between the periods
+        a week overlaps by day-weight (see AllocationMatrix).
+        """
+        period_class = PERIOD_TYPES[period_type]
+        if self.period_class.prefix not in period_class.contains:
+            raise ValidationError(
+                f"{self.period_class.__name__} cannot be resampled to {period_class.__name__}"
+            )
+        if how not in ("sum", "mean"):
+            raise ValueError(f"unknown resample method: {how}")
+        if not len(self):
+            raise ValidationError("cannot resample an empty series")
+        if self.period_class is WeeklyPeriod:
+            allocation = AllocationMatrix(self.index[0], self.index[-1], period_type, inclusive=True)
+            totals = allocation.allocate(self.values)
+            counts = allocation.allocate(np.ones(len(self)))
+            start = allocation.targets.ordinals.start
+        else:
+            factor = MONTHS[period_class.prefix] // MONTHS[self.period_class.prefix]
+            parents = np.arange(self.start, self.stop) // factor
+            start = parents[0]
+            totals = np.bincount(parents - start, weights=self.values)
+            counts = np.bincount(parents - start)
+        values = totals / counts if how == "mean" else totals
+        return PeriodSeries(period_class.from_ordinal(int(start)), values)
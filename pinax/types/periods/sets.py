@@ -0,0 +1,196 @@
+import bisect
+import datetime
+
+from . import (
+    PERIOD_PREFIXES,
+    MonthlyPeriod,
+    Period,
+    QuarterlyPeriod,
+    WeeklyPeriod,
+    YearlyPeriod,
+    get_period,
+    period_sort_key,
+)
+from .index import as_date
+
+# tried in this order when covering a span, so ties go to the coarser period
+COVERING_TYPES = [YearlyPeriod, QuarterlyPeriod, MonthlyPeriod, WeeklyPeriod]
+
+
+def merge(intervals):
+    """
+    sort (start, end) day ordinal intervals and merge overlapping or adjacent
+    ones
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covering_steps(day, start, end):
+    """
+    the (raw period, next uncovered day) choices for covering day within the
+    interval start to end: every period containing day that lies within the
+    interval or, if there is none, the week containing day
+    """
+    date = datetime.date.fromordinal(day)
+    steps = []
+    for period_class in COVERING_TYPES:
+        period = get_period(period_class.from_ordinal(period_class.ordinal_for_date(date)))
+        period_start, period_end = period.get_start_end()
+        if period_start.toordinal() >= start and period_end.toordinal() <= end:
+            steps.append((period.raw_value, period_end.toordinal() + 1))
+    if not steps:
+        week = get_period(WeeklyPeriod.for_date(date))
+        steps.append((week.raw_value, week.end.toordinal() + 1))
+    return steps
+
+
+def cover_interval(start, end):
+    """
+    a minimal list of periods covering the day ordinals start to end,
+    found by a breadth-first search over period boundaries. Only weeks
+    containing days that no aligned period can reach extend past the interval.
+    """
+    parents = {start: None}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for day in frontier:
+            for raw, after in covering_steps(day, start, end):
+                if after > end:
+                    periods = [raw]
+                    while parents[day] is not None:
+                        day, raw = parents[day]
+                        periods.append(raw)
+                    return periods[::-1]
+                if after not in parents:
+                    parents[after] = (day, raw)
+                    next_frontier.append(after)
+        frontier = next_frontier
+    return []
+
+
+class PeriodSet:
+    """
+    the days covered by a collection of periods of any types, normalized into
+    sorted, merged (start, end) intervals of day ordinals.
+
+    Supports union (|), intersection (&) and difference (-), coverage checks
+    and cover(), the minimal list of periods covering the set.
+    """
+
+    def __init__(self, periods=()):
+        intervals = []
+        for period in periods:
+            if not isinstance(period, Period):
+                period = get_period(period)
+            start, end = period.get_start_end()
+            intervals.append((start.toordinal(), end.toordinal()))
+        self.intervals = merge(intervals)
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        period_set = cls()
+        period_set.intervals = merge(intervals)
+        return period_set
+
+    @classmethod
+    def from_range(cls, start, end):
+        """
+        the set of all days from start to end (dates or "YYYY-MM-DD" strings)
+        """
+        return cls.from_intervals([(as_date(start).toordinal(), as_date(end).toordinal())])
+
+    def __repr__(self):
+        ranges = ", ".join(f"{start}..{end}" for start, end in self.ranges)
+        return f"<PeriodSet: {ranges}>"
+
+    def __eq__(self, other):
+        if not isinstance(other, PeriodSet):
+            return NotImplemented
+        return self.intervals == other.intervals
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    @property
+    def ranges(self):
+        """
+        the set as a list of (start date, end date) tuples
+        """
+        return [
+            (datetime.date.fromordinal(start), datetime.date.fromordinal(end))
+            for start, end in self.intervals
+        ]
+
+    @property
+    def days(self):
+        return sum(end - start + 1 for start, end in self.intervals)
+
+    def __or__(self, other):
+        return self.from_intervals(self.intervals + other.intervals)
+
+    def __and__(self, other):
+        intervals = []
+        i = j = 0
+        while i < len(self.intervals) and j < len(other.intervals):
+            start = max(self.intervals[i][0], other.intervals[j][0])
+            end = min(self.intervals[i][1], other.intervals[j][1])
+            if start <= end:
+                intervals.append((start, end))
+            if self.intervals[i][1] < other.intervals[j][1]:
+                i += 1
+            else:
+                j += 1
+        return self.from_intervals(intervals)
+
+    def __sub__(self, other):
+        intervals = []
+        j = 0
+        for start, end in self.intervals:
+            while j < len(other.intervals) and other.intervals[j][1] < start:
+                j += 1
+            k = j
+            while k < len(other.intervals) and other.intervals[k][0] <= end:
+                if other.intervals[k][0] > start:
+                    intervals.append((start, other.intervals[k][0] - 1))
+                start = max(start, other.intervals[k][1] + 1)
+                k += 1
+            if start <= end:
+                intervals.append((start, end))
+        return self.from_intervals(intervals)
+
+    def covers(self, start, end):
+        """
+        whether every day from start to end is in the set
+        """
+        start, end = as_date(start).toordinal(), as_date(end).toordinal()
+        position = bisect.bisect_right(self.intervals, (start, float("inf"))) - 1
+        return position >= 0 and self.intervals[position][1] >= end
+
+    def __contains__(self, item):
+        """
+        whether a period (raw value or Period) or a date is in the set
+        """
+        if isinstance(item, str) and item[:1] in PERIOD_PREFIXES:
+            item = get_period(item)
+        if isinstance(item, Period):
+            return self.covers(*item.get_start_end())
+        return self.covers(item, item)
+
+    def cover(self):
+        """
+        a minimal list of raw periods (sorted) whose days are exactly the set,
+        except that days no week, month, quarter or year can cover without
+        spilling outside the set are covered by the week containing them
+        """
+        periods = set()
+        for start, end in self.intervals:
+            periods.update(cover_interval(start, end))
+        return sorted(periods, key=period_sort_key)
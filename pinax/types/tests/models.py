@@ -0,0 +1,22 @@
+from django.db import models
+
+from pinax.types.periods.fields import PeriodField, PeriodOrdinalField
+
+
+class Report(models.Model):
+
+    period = PeriodField(db_index=True)
+    value = models.IntegerField(default=0)
+
+
+class Event(models.Model):
+
+    day = models.DateField()
+    created = models.DateTimeField(null=True)
+    value = models.IntegerField(default=0)
+
+
+class PackedReport(models.Model):
+
+    period = PeriodOrdinalField(null=True, db_index=True)
+    raw_period = PeriodField(null=True)
@@ -1,20 +1,59 @@
 import datetime
+import decimal
+import io
+import pickle
+from unittest import skipIf
 
+from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.writer import OperationWriter
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
 from pinax.types.periods import (
     PERIOD_TYPES,
+    IsoCalendar,
+    MonthlyPeriod,
+    ParseReport,
+    PeriodCache,
+    PeriodRange,
     get_period,
+    iso_week_to_gregorian,
     parse,
+    parse_many,
+    period_cache,
     period_display,
     period_for_date,
+    period_from_ordinal,
     period_range,
+    period_sort_key,
     period_start_end,
+    period_to_ordinal,
     validate,
 )
-from pinax.types.values import VALUE_TYPES
+from pinax.types.periods.fields import (
+    PeriodOrdinalField,
+    pack_period,
+    unpack_period,
+)
+from pinax.types.periods.functions import PeriodEnd, PeriodStart, TruncPeriod
+from pinax.types.periods.index import PeriodIndex
+from pinax.types.periods.iterators import iter_period_chunks
+from pinax.types.periods.operations import CopyPeriods
+from pinax.types.periods.rollup import rollup
+from pinax.types.periods.sets import PeriodSet
+from pinax.types.values import VALUE_TYPES, display_many, validate_many
+
+from .models import Event, PackedReport, Report
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 
 class ValueTypesTests(TestCase):
@@ -227,8 +266,8 @@ class PeriodTests(TestCase):
     def test_less_than_false_1(self):
         self.assertFalse(self.quarter_2 < self.quarter_1)
 
-    def test_less_than_false_2(self):
-        self.assertFalse(self.quarter_1 < self.year)
+    def test_less_than_true_2(self):
+        self.assertTrue(self.quarter_1 < self.year)
 
     def test_greater_than_true(self):
         self.assertTrue(self.quarter_2 > self.quarter_1)
@@ -245,8 +284,8 @@ class PeriodTests(TestCase):
     def test_less_than_or_equal_false_1(self):
         self.assertFalse(self.quarter_2 <= self.quarter_1)
 
-    def test_less_than_or_equal_false_2(self):
-        self.assertFalse(self.quarter_1 <= self.year)
+    def test_less_than_or_equal_true_2(self):
+        self.assertTrue(self.quarter_1 <= self.year)
 
     def test_greater_than_or_equal_true(self):
         self.assertTrue(self.quarter_2 >= self.quarter_1)
@@ -287,6 +326,29 @@ class PeriodTests(TestCase):
     def test_parse_month_6(self):
         self.assertEquals(parse("2015 January"), "M-2015-01")
 
+    def test_parse_month_7(self):
+        self.assertEquals(parse("2015-01"), "M-2015-01")
+
+    def test_parse_month_8(self):
+        self.assertEquals(parse("DECEMBER 1999"), "M-1999-12")
+
+    def test_parse_month_9(self):
+        self.assertEquals(parse("Sept 2015"), "M-2015-09")
+
+    def test_parse_month_fast_path_skips_dateutil(self):
+        from pinax.types import periods
+        original = periods.dateutil_parse
+        periods.dateutil_parse = None
+        try:
+            self.assertEquals(parse("12/2015"), "M-2015-12")
+            self.assertEquals(parse("Dec 2015"), "M-2015-12")
+            self.assertEquals(parse("2015-12"), "M-2015-12")
+        finally:
+            periods.dateutil_parse = original
+
+    def test_parse_month_invalid_month_number(self):
+        self.assertIsNone(parse("2015-13"))
+
     def test_parse_quarter_1(self):
         self.assertEquals(parse("2015Q1"), "Q-2015-1")
 
@@ -437,3 +499,1210 @@ class PeriodTests(TestCase):
 
     def test_weekly_period_type_start_end(self):
         self.assertEquals(period_start_end("W-2013-32"), (datetime.date(2013, 8, 5), datetime.date(2013, 8, 11)))
+
+
+class PeriodCacheTests(TestCase):
+
+    def test_get_period_is_interned(self):
+        self.assertIs(get_period("M-2015-01"), get_period("M-2015-01"))
+
+    def test_period_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            get_period("M-2015-01").raw_value = "M-2015-02"
+
+    def test_invalid_period_is_not_cached(self):
+        cache = PeriodCache()
+        with self.assertRaises(ValidationError):
+            cache.get("M-2015-13")
+        self.assertEquals(len(cache), 0)
+
+    def test_hits_and_misses(self):
+        cache = PeriodCache()
+        cache.get("Y-2015")
+        cache.get("Y-2015")
+        cache.get("Y-2016")
+        self.assertEquals(cache.info(), {"hits": 1, "misses": 2, "maxsize": 8192, "size": 2})
+
+    def test_bounded_lru_evicts_least_recently_used(self):
+        cache = PeriodCache(maxsize=2)
+        first = cache.get("Y-2015")
+        cache.get("Y-2016")
+        cache.get("Y-2015")
+        cache.get("Y-2017")
+        self.assertEquals(list(cache.periods), ["Y-2015", "Y-2017"])
+        self.assertIs(cache.get("Y-2015"), first)
+
+    def test_resize_trims(self):
+        cache = PeriodCache()
+        for raw in ["Y-2015", "Y-2016", "Y-2017"]:
+            cache.get(raw)
+        cache.resize(1)
+        self.assertEquals(list(cache.periods), ["Y-2017"])
+
+    def test_zero_maxsize_disables_interning(self):
+        cache = PeriodCache(maxsize=0)
+        self.assertIsNot(cache.get("Y-2015"), cache.get("Y-2015"))
+
+    def test_clear(self):
+        get_period("Y-2015")
+        period_cache.clear()
+        self.assertEquals(period_cache.info()["size"], 0)
+        self.assertEquals(period_cache.info()["hits"], 0)
+
+    def test_sub_periods_are_interned(self):
+        self.assertIs(get_period("Q-2015-1").sub_periods("monthly")[0], get_period("M-2015-01"))
+
+
+class PeriodOrdinalTests(TestCase):
+
+    def test_monthly_ordinal(self):
+        self.assertEquals(period_to_ordinal("M-2015-01"), 2015 * 12)
+        self.assertEquals(period_from_ordinal("monthly", 2015 * 12 + 11), "M-2015-12")
+
+    def test_quarterly_ordinal(self):
+        self.assertEquals(period_to_ordinal("Q-2015-3"), 2015 * 4 + 2)
+        self.assertEquals(period_from_ordinal("quarterly", 2015 * 4 + 2), "Q-2015-3")
+
+    def test_yearly_ordinal(self):
+        self.assertEquals(period_to_ordinal("Y-2015"), 2015)
+        self.assertEquals(period_from_ordinal("yearly", 2015), "Y-2015")
+
+    def test_weekly_ordinal_round_trip_across_53_week_year(self):
+        ordinal = period_to_ordinal("W-2015-53")
+        self.assertEquals(period_from_ordinal("weekly", ordinal), "W-2015-53")
+        self.assertEquals(period_from_ordinal("weekly", ordinal + 1), "W-2016-01")
+        self.assertEquals(period_from_ordinal("weekly", ordinal - 52), "W-2015-01")
+
+    def test_weekly_ordinals_are_dense(self):
+        raws = list(period_range("W-2010-01", "W-2020-01"))
+        ordinals = [period_to_ordinal(raw) for raw in raws]
+        self.assertEquals(ordinals, list(range(ordinals[0], ordinals[0] + len(raws))))
+
+    def test_add(self):
+        self.assertEquals(get_period("M-2015-11") + 3, get_period("M-2016-02"))
+        self.assertEquals(2 + get_period("Q-2015-4"), get_period("Q-2016-2"))
+        self.assertEquals(get_period("W-2015-52") + 2, get_period("W-2016-01"))
+
+    def test_subtract_int(self):
+        self.assertEquals(get_period("Y-2015") - 5, get_period("Y-2010"))
+
+    def test_distance(self):
+        self.assertEquals(get_period("M-2016-02") - get_period("M-2015-11"), 3)
+        self.assertEquals(get_period("W-2016-01") - get_period("W-2015-01"), 53)
+
+    def test_distance_between_types(self):
+        with self.assertRaises(TypeError):
+            get_period("M-2016-02") - get_period("Y-2015")
+
+
+class PeriodRangeTests(TestCase):
+
+    def setUp(self):
+        self.weeks = period_range("W-1990-01", "W-2030-01")
+
+    def test_is_lazy_sequence(self):
+        self.assertIsInstance(self.weeks, PeriodRange)
+        self.assertEquals(len(self.weeks), 2087)
+
+    def test_repeated_iteration(self):
+        months = period_range("M-2015-11", "M-2016-02")
+        self.assertEquals(list(months), list(months))
+
+    def test_indexing(self):
+        self.assertEquals(self.weeks[0], "W-1990-01")
+        self.assertEquals(self.weeks[-1], "W-2029-52")
+
+    def test_slicing_with_step(self):
+        months = period_range("M-2015-01", "M-2016-01")
+        self.assertEquals(list(months[::3]), ["M-2015-01", "M-2015-04", "M-2015-07", "M-2015-10"])
+        self.assertIsInstance(months[2:5], PeriodRange)
+
+    def test_reversed(self):
+        self.assertEquals(list(reversed(period_range("Y-2010", "Y-2013"))), ["Y-2012", "Y-2011", "Y-2010"])
+
+    def test_contains(self):
+        self.assertIn("W-2015-53", self.weeks)
+        self.assertIn(get_period("W-2015-53"), self.weeks)
+        self.assertNotIn("W-2030-01", self.weeks)
+        self.assertNotIn("M-2015-01", self.weeks)
+        self.assertNotIn("W-2014-53", self.weeks)
+        self.assertNotIn("Patrick", self.weeks)
+        quarters = period_range("Q-2015-1", "Q-2016-1")
+        self.assertNotIn("Q-2015", quarters)
+        with self.assertRaises(ValueError):
+            quarters.index("Q-2015")
+
+    def test_index(self):
+        self.assertEquals(self.weeks.index("W-1990-03"), 2)
+        with self.assertRaises(ValueError):
+            self.weeks.index("W-2031-01")
+
+    def test_range_validates_eagerly(self):
+        with self.assertRaises(ValidationError):
+            period_range("M-2015-13", "M-2016-01")
+
+
+class IsoCalendarTests(TestCase):
+
+    def test_weeks_in_year(self):
+        calendar = IsoCalendar(2000, 2030)
+        self.assertEquals(calendar.weeks_in_year(2015), 53)
+        self.assertEquals(calendar.weeks_in_year(2016), 52)
+        self.assertEquals(calendar.weeks_in_year(2020), 53)
+
+    def test_year_week_matches_isocalendar_inside_and_outside_span(self):
+        calendar = IsoCalendar(2010, 2012)
+        date = datetime.date(2007, 12, 31)
+        while date < datetime.date(2015, 1, 5):
+            ordinal = PERIOD_TYPES["weekly"].ordinal_for_date(date)
+            self.assertEquals(calendar.year_week(ordinal), date.isocalendar()[:2])
+            date += datetime.timedelta(days=1)
+
+    def test_set_span(self):
+        calendar = IsoCalendar(2010, 2012)
+        calendar.set_span(1950, 1960)
+        self.assertEquals(len(calendar.week_ones), 12)
+        self.assertEquals(calendar.week_start(1955, 1), datetime.date(1955, 1, 3))
+
+    def test_set_span_full_range(self):
+        calendar = IsoCalendar(2010, 2012)
+        calendar.set_span(datetime.MINYEAR, datetime.MAXYEAR)
+        self.assertEquals(calendar.weeks_in_year(9999), 52)
+        self.assertEquals(calendar.week_start(150, 10), datetime.date(150, 3, 2))
+        self.assertEquals(calendar.year_week(calendar.week_ordinal(2015, 10)), (2015, 10))
+
+    def test_failed_set_span_keeps_table(self):
+        calendar = IsoCalendar(2010, 2012)
+        with self.assertRaises(ValueError):
+            calendar.set_span(0, 2020)
+        self.assertEquals((calendar.first_year, calendar.last_year, len(calendar.week_ones)), (2010, 2012, 4))
+        self.assertEquals(calendar.week_start(2011, 10), datetime.date(2011, 3, 7))
+
+    def test_iso_week_to_gregorian(self):
+        self.assertEquals(iso_week_to_gregorian(2015, 1), datetime.date(2014, 12, 29))
+        self.assertEquals(iso_week_to_gregorian(2015, 53), datetime.date(2015, 12, 28))
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class PeriodsForDatesTests(TestCase):
+
+    def setUp(self):
+        start = datetime.date(2008, 12, 20)
+        self.dates = [start + datetime.timedelta(days=i) for i in range(3000)]
+
+    def test_matches_scalar_path_for_all_types(self):
+        from pinax.types.periods.arrays import periods_for_dates
+        for period_type in PERIOD_TYPES:
+            raws = periods_for_dates(period_type, numpy.array(self.dates, dtype="datetime64[D]"))
+            self.assertEquals(list(raws), [period_for_date(period_type, date) for date in self.dates])
+
+    def test_ordinals(self):
+        from pinax.types.periods.arrays import periods_for_dates
+        for period_type, period_class in PERIOD_TYPES.items():
+            ordinals = periods_for_dates(period_type, self.dates, ordinals=True)
+            self.assertEquals(
+                list(ordinals),
+                [period_class.ordinal_for_date(date) for date in self.dates]
+            )
+
+    def test_datetimes_are_truncated_to_days(self):
+        from pinax.types.periods.arrays import periods_for_dates
+        dates = numpy.array(["2015-12-31T23:59:59", "2016-01-01T00:00:00"], dtype="datetime64[s]")
+        self.assertEquals(list(periods_for_dates("yearly", dates)), ["Y-2015", "Y-2016"])
+
+    def test_nat_is_rejected(self):
+        from pinax.types.periods.arrays import periods_for_dates
+        with self.assertRaises(ValidationError):
+            periods_for_dates("monthly", numpy.array(["2015-01-01", "NaT"], dtype="datetime64[D]"))
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class PeriodStartEndManyTests(TestCase):
+
+    def test_matches_scalar_path_for_mixed_types(self):
+        from pinax.types.periods.arrays import period_start_end_many
+        periods = (
+            list(period_range("W-2014-50", "W-2016-03")) +
+            list(period_range("M-2015-11", "M-2016-04")) +
+            list(period_range("Q-2015-3", "Q-2016-3")) +
+            list(period_range("Y-1999", "Y-2002")) +
+            ["M-2016-02", "W-2015-53", "M-2016-02"]
+        )
+        starts, ends = period_start_end_many(periods)
+        self.assertEquals(starts.dtype, numpy.dtype("datetime64[D]"))
+        self.assertEquals(
+            list(zip(starts.tolist(), ends.tolist())),
+            [period_start_end(period) for period in periods]
+        )
+
+    def test_invalid_prefix(self):
+        from pinax.types.periods.arrays import period_start_end_many
+        with self.assertRaises(ValidationError):
+            period_start_end_many(["M-2015-01", "X-2015"])
+
+    def test_invalid_periods(self):
+        from pinax.types.periods.arrays import period_start_end_many
+        for invalid in ["M-2015-13", "W-2015-99"]:
+            with self.assertRaises(ValidationError):
+                period_start_end_many(["M-2015-01", invalid])
+
+
+class ParseManyTests(TestCase):
+
+    def test_parses_like_parse(self):
+        values = ["2015W3", "Jan 2015", "2015Q1", "2015", "Jan 2015"]
+        self.assertEquals(list(parse_many(values)), [parse(value) for value in values])
+
+    def test_collects_errors_without_raising(self):
+        report = ParseReport()
+        values = ["2015Q1", "Patrick", "2015Q5", "Patrick", None, ("a", "b"), 2015]
+        self.assertEquals(list(parse_many(values, report)), ["Q-2015-1", None, None, None, None, None, None])
+        self.assertEquals(report.count, 7)
+        self.assertEquals(report.indices, [1, 2, 3, 4, 5, 6])
+        self.assertEquals(report.errors[0], (1, "Cannot Parse: Patrick"))
+        self.assertEquals(report.errors[1], (2, "Incorrect value: Q-2015-5"))
+        self.assertEquals(report.errors[4], (5, "Cannot Parse: ('a', 'b')"))
+
+    def test_memoizes_distinct_values(self):
+        from pinax.types import periods
+        calls = []
+        original = periods.parse
+
+        def counting_parse(value):
+            calls.append(value)
+            return original(value)
+
+        periods.parse = counting_parse
+        try:
+            list(parse_many(["Jan 2015", "Feb 2015"] * 50))
+        finally:
+            periods.parse = original
+        self.assertEquals(calls, ["Jan 2015", "Feb 2015"])
+
+    def test_memo_size_bounds_memo(self):
+        values = ["Jan 2015", "Feb 2015", "Jan 2015"]
+        self.assertEquals(list(parse_many(values, memo_size=1)), ["M-2015-01", "M-2015-02", "M-2015-01"])
+
+    def test_streams(self):
+        def values():
+            yield "2015"
+            raise AssertionError("read too far")
+
+        self.assertEquals(next(parse_many(values())), "Y-2015")
+
+
+class PeriodValueObjectTests(TestCase):
+
+    def test_hashable(self):
+        totals = {get_period("M-2015-01"): 1}
+        self.assertEquals(totals[get_period("M-2015-01")], 1)
+        self.assertEquals(len({get_period("Y-2015"), get_period("Y-2015"), get_period("Q-2015-1")}), 2)
+
+    def test_equal_periods_hash_equal(self):
+        cache = PeriodCache(maxsize=0)
+        self.assertEquals(hash(cache.get("W-2015-03")), hash(cache.get("W-2015-03")))
+
+    def test_slotted(self):
+        with self.assertRaises(AttributeError):
+            get_period("Y-2015").__dict__
+
+    def test_cached_derived_fields(self):
+        period = PeriodCache(maxsize=0).get("Q-2015-3")
+        self.assertEquals(period.start, datetime.date(2015, 7, 1))
+        self.assertEquals(period.end, datetime.date(2015, 9, 30))
+        self.assertEquals(period.year, 2015)
+        self.assertEquals(period.ordinal, 2015 * 4 + 2)
+        self.assertIs(period.get_start_end(), period.get_start_end())
+
+    def test_cached_fields_cannot_be_assigned(self):
+        with self.assertRaises(AttributeError):
+            get_period("Y-2015").start = datetime.date(2016, 1, 1)
+
+    def test_pickle_round_trip_is_interned(self):
+        period = get_period("W-2015-53")
+        self.assertIs(pickle.loads(pickle.dumps(period)), period)
+
+    def test_repr(self):
+        self.assertEquals(repr(get_period("M-2015-01")), "<MonthlyPeriod: M-2015-01>")
+
+
+class PeriodOrderingTests(TestCase):
+
+    def test_previous_quarter_is_before_year(self):
+        self.assertTrue(get_period("Q-2014-4") < get_period("Y-2015"))
+        self.assertTrue(get_period("Y-2015") > get_period("Q-2014-4"))
+
+    def test_same_start_orders_shorter_first(self):
+        self.assertTrue(get_period("M-2015-01") < get_period("Q-2015-1") < get_period("Y-2015"))
+
+    def test_sorting_mixed_types(self):
+        raws = ["Y-2015", "M-2015-02", "W-2015-01", "Q-2015-1", "M-2015-01", "Q-2014-4"]
+        self.assertEquals(
+            sorted(raws, key=period_sort_key),
+            ["Q-2014-4", "W-2015-01", "M-2015-01", "Q-2015-1", "Y-2015", "M-2015-02"]
+        )
+        self.assertEquals(
+            sorted(get_period(raw) for raw in raws),
+            sorted((get_period(raw) for raw in raws), key=period_sort_key)
+        )
+
+    def test_sort_key_is_int(self):
+        self.assertIsInstance(period_sort_key("W-2015-53"), int)
+        self.assertEquals(period_sort_key("W-2015-53"), get_period("W-2015-53").sort_key)
+
+    def test_comparing_with_non_period(self):
+        with self.assertRaises(TypeError):
+            get_period("Y-2015") < "Y-2016"
+
+
+class RollupTests(TestCase):
+
+    def setUp(self):
+        self.pairs = [(raw, i + 1) for i, raw in enumerate(period_range("W-2014-50", "W-2016-03"))]
+        self.pairs += [("M-2015-01", 100), ("M-2015-04", 200), ("Q-2015-2", 1000)]
+
+    def test_matches_includes(self):
+        aggregates = rollup(self.pairs)
+        parents = {raw for raw in aggregates}
+        for parent in parents:
+            values = [
+                value for raw, value in self.pairs
+                if get_period(parent).includes(get_period(raw))
+            ]
+            aggregate = aggregates[parent]
+            self.assertEquals(aggregate.count, len(values))
+            self.assertEquals(aggregate.total, sum(values))
+            self.assertEquals(aggregate.minimum, min(values))
+            self.assertEquals(aggregate.maximum, max(values))
+
+    def test_straddling_week_is_not_rolled_into_month(self):
+        aggregates = rollup([("W-2015-05", 1), ("W-2015-06", 2)])
+        self.assertEquals(aggregates["M-2015-02"].total, 2)
+        self.assertNotIn("M-2015-01", aggregates)
+        self.assertEquals(aggregates["Q-2015-1"].total, 3)
+        self.assertEquals(aggregates["Y-2015"].mean, 1.5)
+
+    def test_levels(self):
+        aggregates = rollup([("M-2015-01", 1), ("M-2015-05", 2)], levels=["yearly"])
+        self.assertEquals(list(aggregates), ["Y-2015"])
+
+    def test_decimal_value_types_are_exact(self):
+        pairs = [("M-2015-01", "0.10"), ("M-2015-02", "0.20"), ("M-2015-03", 0.3)]
+        aggregates = rollup(pairs, value_type="monetary")
+        self.assertEquals(aggregates["Q-2015-1"].total, decimal.Decimal("0.60"))
+
+    def test_float_accumulation_by_default(self):
+        aggregates = rollup([("M-2015-01", "0.5"), ("M-2015-02", 2)])
+        self.assertIsInstance(aggregates["Y-2015"].total, float)
+
+    def test_traffic_light_values_are_ints(self):
+        aggregates = rollup([("M-2015-01", "1"), ("M-2015-02", "3")], value_type="traffic-light")
+        self.assertEquals(aggregates["Q-2015-1"].total, 4)
+        self.assertEquals(aggregates["Q-2015-1"].maximum, 3)
+
+    def test_boolean_values_are_counted(self):
+        aggregates = rollup([("M-2015-01", "true"), ("M-2015-02", "false"), ("M-2015-03", True)], "boolean")
+        self.assertEquals((aggregates["Q-2015-1"].count, aggregates["Q-2015-1"].total), (3, 2))
+
+    def test_invalid_boolean_value(self):
+        for value in ["yes", "1", 1, "True"]:
+            with self.assertRaises(ValidationError):
+                rollup([("M-2015-01", "true"), ("M-2015-02", value)], value_type="boolean")
+
+    def test_invalid_values(self):
+        cases = [
+            ("traffic-light", "1", ["7", 0, "red", None]),
+            ("integer", "1", ["1.5", "foo", None]),
+            ("decimal", "1.5", ["foo", None]),
+            ("hours", "1.5", ["foo", "1,5"]),
+            ("monetary", "1.5", ["$1"]),
+        ]
+        for value_type, valid, invalid in cases:
+            for value in invalid:
+                with self.assertRaises(ValidationError):
+                    rollup([("M-2015-01", valid), ("M-2015-02", value)], value_type=value_type)
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class AllocationMatrixTests(TestCase):
+
+    def test_overlap_days_match_start_end(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        for period_type in ["monthly", "quarterly", "yearly"]:
+            allocation = AllocationMatrix("W-2014-50", "W-2016-10", period_type)
+            matrix = allocation.to_dense(fractions=False)
+            for i, week in enumerate(allocation.weeks):
+                start, end = period_start_end(week)
+                for j, target in enumerate(allocation.targets):
+                    target_start, target_end = period_start_end(target)
+                    overlap = (min(end, target_end) - max(start, target_start)).days + 1
+                    self.assertEquals(matrix[i, j], max(overlap, 0))
+
+    def test_straddling_week(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        allocation = AllocationMatrix("W-2015-05", "W-2015-05", "monthly", inclusive=True)
+        self.assertEquals(list(allocation.targets), ["M-2015-01", "M-2015-02"])
+        self.assertEquals(allocation.to_dense(fractions=False).tolist(), [[6, 1]])
+
+    def test_allocate(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        allocation = AllocationMatrix("W-2015-01", "W-2016-01", "monthly")
+        values = numpy.arange(len(allocation.weeks), dtype=float)
+        self.assertTrue(numpy.allclose(allocation.allocate(values), allocation.to_dense().T @ values))
+        self.assertAlmostEqual(allocation.allocate(values).sum(), values.sum())
+
+    def test_allocate_columns(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        allocation = AllocationMatrix("W-2015-01", "W-2016-01", "quarterly")
+        values = numpy.ones((len(allocation.weeks), 2))
+        self.assertEquals(list(allocation.targets), ["Q-2014-4", "Q-2015-1", "Q-2015-2", "Q-2015-3", "Q-2015-4", "Q-2016-1"])
+        self.assertEquals(allocation.allocate(values).shape, (6, 2))
+        self.assertAlmostEqual(allocation.allocate(values)[0, 1], 3 / 7)
+        self.assertAlmostEqual(allocation.allocate(values)[:, 1].sum(), 53)
+
+    def test_allocate_wrong_length(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        with self.assertRaises(ValueError):
+            AllocationMatrix("W-2015-01", "W-2016-01", "monthly").allocate([1, 2])
+
+    def test_cannot_allocate_to_weeks(self):
+        from pinax.types.periods.allocation import AllocationMatrix
+        with self.assertRaises(ValidationError):
+            AllocationMatrix("W-2015-01", "W-2016-01", "weekly")
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class PeriodSeriesTests(TestCase):
+
+    def setUp(self):
+        from pinax.types.periods.series import PeriodSeries
+        self.PeriodSeries = PeriodSeries
+        self.months = PeriodSeries("M-2015-01", range(1, 13))
+
+    def test_lookup(self):
+        self.assertEquals(len(self.months), 12)
+        self.assertEquals(self.months["M-2015-03"], 3)
+        self.assertEquals(self.months[get_period("M-2015-12")], 12)
+        self.assertIn("M-2015-06", self.months)
+        self.assertNotIn("M-2016-01", self.months)
+        self.assertIsNone(self.months.get("Y-2015"))
+        with self.assertRaises(KeyError):
+            self.months["M-2016-01"]
+
+    def test_setitem(self):
+        self.months["M-2015-02"] = 20
+        self.assertEquals(self.months["M-2015-02"], 20)
+
+    def test_from_dict(self):
+        series = self.PeriodSeries.from_dict({"Q-2015-4": 1, get_period("Q-2016-2"): 3})
+        self.assertEquals(list(series), ["Q-2015-4", "Q-2016-1", "Q-2016-2"])
+        self.assertTrue(numpy.isnan(series["Q-2016-1"]))
+
+    def test_aligned_arithmetic(self):
+        other = self.PeriodSeries("M-2015-11", [10, 20, 30])
+        total = self.months + other
+        self.assertEquals(list(total.index), list(period_range("M-2015-01", "M-2016-02")))
+        self.assertEquals(total["M-2015-11"], 21)
+        self.assertTrue(numpy.isnan(total["M-2015-01"]))
+        self.assertTrue(numpy.isnan(total["M-2016-01"]))
+        self.assertEquals((other - self.months)["M-2015-12"], 8)
+        self.assertEquals((other * self.months)["M-2015-12"], 240)
+        self.assertEquals((other / self.months)["M-2015-11"], 10 / 11)
+
+    def test_scalar_arithmetic(self):
+        self.assertEquals((self.months * 2)["M-2015-03"], 6)
+        self.assertEquals((12 - self.months)["M-2015-03"], 9)
+        self.assertEquals((1 + self.months)["M-2015-03"], 4)
+
+    def test_different_types_cannot_be_combined(self):
+        with self.assertRaises(ValidationError):
+            self.months + self.PeriodSeries("Y-2015", [1])
+
+    def test_reindex(self):
+        series = self.months.reindex(period_range("M-2014-12", "M-2015-03"), fill=0)
+        self.assertEquals(list(series.items()), [("M-2014-12", 0), ("M-2015-01", 1), ("M-2015-02", 2)])
+
+    def test_resample_months(self):
+        quarters = self.months.resample("quarterly")
+        self.assertEquals(list(quarters.items()), [("Q-2015-1", 6), ("Q-2015-2", 15), ("Q-2015-3", 24), ("Q-2015-4", 33)])
+        self.assertEquals(list(self.months.resample("yearly", how="mean").items()), [("Y-2015", 6.5)])
+
+    def test_resample_weeks_by_day_weight(self):
+        weeks = self.PeriodSeries("W-2015-05", [7, 7])
+        self.assertEquals(list(weeks.resample("monthly").items()), [("M-2015-01", 6), ("M-2015-02", 8)])
+
+    def test_resample_to_finer_type(self):
+        with self.assertRaises(ValidationError):
+            self.months.resample("weekly")
+
+
+class PeriodSpanTests(TestCase):
+
+    def test_overlapping(self):
+        self.assertEquals(
+            list(PERIOD_TYPES["monthly"].overlapping(datetime.date(2015, 1, 31), datetime.date(2015, 3, 1))),
+            ["M-2015-01", "M-2015-02", "M-2015-03"]
+        )
+
+    def test_within(self):
+        self.assertEquals(
+            list(PERIOD_TYPES["monthly"].within(datetime.date(2015, 1, 31), datetime.date(2015, 3, 31))),
+            ["M-2015-02", "M-2015-03"]
+        )
+        self.assertEquals(
+            list(PERIOD_TYPES["weekly"].within(datetime.date(2015, 1, 1), datetime.date(2015, 1, 31))),
+            ["W-2015-02", "W-2015-03", "W-2015-04"]
+        )
+
+    def test_within_too_short(self):
+        self.assertEquals(len(PERIOD_TYPES["yearly"].within(datetime.date(2015, 1, 1), datetime.date(2015, 6, 30))), 0)
+
+
+class PeriodIndexTests(TestCase):
+
+    def setUp(self):
+        self.raws = ["Y-2015", "Q-2015-1", "Q-2015-2", "M-2015-01", "M-2015-03", "W-2015-05", "W-2015-10", "Y-2016"]
+        self.index = PeriodIndex(self.raws)
+
+    def brute_force(self, predicate):
+        return sorted(raw for raw in self.raws if predicate(*period_start_end(raw)))
+
+    def raws_of(self, periods):
+        return sorted(period.raw_value for period in periods)
+
+    def test_len_and_contains(self):
+        self.assertEquals(len(self.index), 8)
+        self.assertIn("M-2015-03", self.index)
+        self.assertIn(get_period("Y-2016"), self.index)
+        self.assertNotIn("M-2015-02", self.index)
+
+    def test_at(self):
+        date = datetime.date(2015, 1, 29)
+        self.assertEquals(
+            self.raws_of(self.index.at(date)),
+            self.brute_force(lambda start, end: start <= date <= end)
+        )
+
+    def test_overlapping(self):
+        start, end = datetime.date(2015, 2, 1), datetime.date(2015, 3, 2)
+        self.assertEquals(
+            self.raws_of(self.index.overlapping("2015-02-01", "2015-03-02")),
+            self.brute_force(lambda s, e: s <= end and e >= start)
+        )
+
+    def test_within(self):
+        start, end = datetime.date(2015, 1, 1), datetime.date(2015, 3, 31)
+        self.assertEquals(
+            self.raws_of(self.index.within(start, end)),
+            self.brute_force(lambda s, e: s >= start and e <= end)
+        )
+
+    def test_containing(self):
+        start, end = datetime.date(2015, 3, 2), datetime.date(2015, 3, 8)
+        self.assertEquals(
+            self.raws_of(self.index.containing(start, end)),
+            self.brute_force(lambda s, e: s <= start and e >= end)
+        )
+
+    def test_add_and_remove(self):
+        self.index.add("M-2015-02")
+        self.index.add("M-2015-02")
+        self.assertEquals(len(self.index), 9)
+        self.assertEquals(self.raws_of(self.index.at(datetime.date(2015, 2, 14))), ["M-2015-02", "Q-2015-1", "Y-2015"])
+        self.index.remove("M-2015-02")
+        self.assertNotIn("M-2015-02", self.index)
+        with self.assertRaises(KeyError):
+            self.index.remove("M-2015-02")
+        self.index.discard("M-2015-02")
+
+
+class PeriodSetTests(TestCase):
+
+    def days(self, period_set):
+        return {
+            start + datetime.timedelta(days=i)
+            for start, end in period_set.ranges
+            for i in range((end - start).days + 1)
+        }
+
+    def test_normalizes_into_merged_intervals(self):
+        period_set = PeriodSet(["M-2015-02", "M-2015-01", "W-2015-05", "Y-2017"])
+        self.assertEquals(period_set.ranges, [
+            (datetime.date(2015, 1, 1), datetime.date(2015, 2, 28)),
+            (datetime.date(2017, 1, 1), datetime.date(2017, 12, 31)),
+        ])
+        self.assertEquals(period_set.days, 59 + 365)
+
+    def test_algebra_matches_day_sets(self):
+        left = PeriodSet(["Q-2015-1", "W-2015-20", "M-2015-09", "Y-2016"])
+        right = PeriodSet(["M-2015-02", "W-2015-10", "W-2015-21", "Q-2015-3", "M-2016-06"])
+        self.assertEquals(self.days(left | right), self.days(left) | self.days(right))
+        self.assertEquals(self.days(left & right), self.days(left) & self.days(right))
+        self.assertEquals(self.days(left - right), self.days(left) - self.days(right))
+        self.assertEquals(self.days(right - left), self.days(right) - self.days(left))
+
+    def test_covers(self):
+        period_set = PeriodSet(["Q-2015-1", "M-2015-04"])
+        self.assertTrue(period_set.covers("2015-02-01", "2015-04-30"))
+        self.assertFalse(period_set.covers("2015-02-01", "2015-05-01"))
+        self.assertFalse(period_set.covers("2014-12-31", "2015-01-01"))
+        self.assertIn("M-2015-03", period_set)
+        self.assertIn(datetime.date(2015, 4, 30), period_set)
+        self.assertNotIn("W-2015-01", period_set)
+
+    def test_cover_prefers_coarse_periods(self):
+        months = [f"M-2015-{month:02d}" for month in range(1, 13)] + ["M-2016-01", "M-2016-02", "M-2016-03"]
+        self.assertEquals(PeriodSet(months).cover(), ["Y-2015", "Q-2016-1"])
+
+    def test_cover_unaligned_span(self):
+        cover = PeriodSet.from_range("2015-01-15", "2015-03-31").cover()
+        self.assertEquals(cover, ["W-2015-03", "W-2015-04", "W-2015-05", "M-2015-02", "M-2015-03"])
+
+    def test_cover_round_trips(self):
+        period_set = PeriodSet(["Q-2015-2", "M-2015-07", "W-2015-33", "W-2015-34", "Y-2016", "M-2017-01"])
+        self.assertEquals(PeriodSet(period_set.cover()), period_set)
+
+
+class PeriodLookupTests(TestCase):
+
+    def setUp(self):
+        self.raws = (
+            list(period_range("W-2014-50", "W-2016-03")) +
+            list(period_range("M-2014-11", "M-2016-03")) +
+            list(period_range("Q-2014-3", "Q-2016-2")) +
+            ["Y-2014", "Y-2015", "Y-2016"]
+        )
+        Report.objects.bulk_create([Report(period=raw) for raw in self.raws])
+
+    def periods(self, queryset):
+        return sorted(str(report.period) for report in queryset)
+
+    def test_within(self):
+        for raw in ["Y-2015", "Q-2015-1", "M-2015-02", "W-2015-06"]:
+            period = get_period(raw)
+            self.assertEquals(
+                self.periods(Report.objects.filter(period__within=raw)),
+                sorted(other for other in self.raws if period.includes(get_period(other)))
+            )
+
+    def test_within_period_object(self):
+        self.assertEquals(len(Report.objects.filter(period__within=get_period("Q-2015-2"))), 1 + 3 + 12)
+
+    def test_overlaps(self):
+        start, end = datetime.date(2015, 3, 1), datetime.date(2015, 6, 30)
+        self.assertEquals(
+            self.periods(Report.objects.filter(period__overlaps=("2015-03-01", "2015-06-30"))),
+            sorted(
+                raw for raw in self.raws
+                if period_start_end(raw)[0] <= end and period_start_end(raw)[1] >= start
+            )
+        )
+
+    def test_type(self):
+        self.assertEquals(
+            self.periods(Report.objects.filter(period__type="quarterly")),
+            sorted(raw for raw in self.raws if raw.startswith("Q-"))
+        )
+
+    def test_invalid_type(self):
+        with self.assertRaises(ValidationError):
+            list(Report.objects.filter(period__type="daily"))
+
+    def test_range_periods(self):
+        self.assertEquals(
+            self.periods(Report.objects.filter(period__range_periods=("M-2015-11", "M-2016-02"))),
+            ["M-2015-11", "M-2015-12", "M-2016-01"]
+        )
+
+    def test_empty_range_periods(self):
+        self.assertEquals(Report.objects.filter(period__range_periods=("M-2015-11", "M-2015-11")).count(), 0)
+
+    def test_compiles_to_range_predicates(self):
+        sql = str(Report.objects.filter(period__within="Y-2015").query)
+        self.assertIn('"tests_report"."period" BETWEEN M-2015-01 AND M-2015-12', sql)
+        self.assertIn('"tests_report"."period" = Y-2015', sql)
+
+
+class TruncPeriodTests(TestCase):
+
+    def setUp(self):
+        # the days around every new year, where ISO weeks and years diverge
+        self.days = [
+            datetime.date(year, 1, 1) + datetime.timedelta(days=offset)
+            for year in range(1999, 2032)
+            for offset in range(-7, 8)
+        ] + [datetime.date(2015, month, 15) for month in range(1, 13)]
+        Event.objects.bulk_create([
+            Event(day=day, created=datetime.datetime.combine(day, datetime.time(23, 59)), value=1)
+            for day in self.days
+        ])
+
+    def test_matches_period_for_date(self):
+        for period_type in PERIOD_TYPES:
+            events = Event.objects.annotate(period=TruncPeriod("day", period_type))
+            for event in events:
+                self.assertEquals(event.period, get_period(period_for_date(period_type, event.day)))
+
+    def test_datetime(self):
+        for period_type in PERIOD_TYPES:
+            events = Event.objects.annotate(period=TruncPeriod("created", period_type))
+            for event in events:
+                self.assertEquals(str(event.period), period_for_date(period_type, event.day))
+
+    def test_group_by(self):
+        totals = (
+            Event.objects.filter(day__year=2015)
+            .values(period=TruncPeriod("day", "quarterly"))
+            .annotate(total=Sum("value"))
+            .order_by("period")
+        )
+        self.assertEquals(
+            [(str(row["period"]), row["total"]) for row in totals],
+            [("Q-2015-1", 3 + 8), ("Q-2015-2", 3), ("Q-2015-3", 3), ("Q-2015-4", 3 + 7)]
+        )
+
+    def test_unknown_period_type(self):
+        with self.assertRaises(KeyError):
+            TruncPeriod("day", "daily")
+
+
+class PeriodStartEndTests(TestCase):
+
+    def setUp(self):
+        self.raws = (
+            [raw for year in range(1999, 2032) for raw in (f"W-{year}-01", f"W-{year}-52")] +
+            ["W-2015-53", "W-2020-53", "W-2026-53"] +
+            list(period_range("M-2015-11", "M-2016-04")) +
+            list(period_range("Q-2015-1", "Q-2017-1")) +
+            ["Y-2015", "Y-2016"]
+        )
+        Report.objects.bulk_create([Report(period=raw) for raw in self.raws])
+        self.reports = Report.objects.annotate(start=PeriodStart("period"), end=PeriodEnd("period"))
+
+    def test_matches_get_start_end(self):
+        for report in self.reports:
+            self.assertEquals((report.start, report.end), report.period.get_start_end())
+
+    def test_filter(self):
+        day = datetime.date(2016, 1, 1)
+        self.assertEquals(
+            sorted(str(report.period) for report in self.reports.filter(start__lte=day, end__gte=day)),
+            sorted(raw for raw in self.raws if get_period(raw).start <= day <= get_period(raw).end)
+        )
+
+    def test_order_by(self):
+        periods = [report.period for report in self.reports.order_by("start", "-end")]
+        self.assertEquals(periods, sorted(periods, key=lambda period: (period.start, -period.end.toordinal())))
+
+    def test_from_trunc_period(self):
+        Event.objects.create(day=datetime.date(2015, 12, 31))
+        event = Event.objects.annotate(
+            start=PeriodStart(TruncPeriod("day", "weekly")),
+            end=PeriodEnd(TruncPeriod("day", "weekly")),
+        ).get()
+        self.assertEquals((event.start, event.end), (datetime.date(2015, 12, 28), datetime.date(2016, 1, 3)))
+
+
+class PeriodOrdinalFieldTests(TestCase):
+
+    def setUp(self):
+        self.raws = (
+            list(period_range("W-2014-50", "W-2016-03")) +
+            list(period_range("M-2014-11", "M-2016-03")) +
+            list(period_range("Q-2014-3", "Q-2016-2")) +
+            ["Y-2014", "Y-2015", "Y-2016"]
+        )
+        PackedReport.objects.bulk_create([PackedReport(period=raw, raw_period=raw) for raw in self.raws])
+
+    def periods(self, queryset):
+        return sorted(str(report.period) for report in queryset)
+
+    def test_pack_unpack(self):
+        for raw in ["W-1999-52", "W-2015-53", "M-2015-01", "Q-2015-4", "Y-2015"]:
+            self.assertEquals(unpack_period(pack_period(raw)), get_period(raw))
+        self.assertEquals(pack_period("Y-2015"), (1 << 32) | 2015)
+
+    def test_loads_periods(self):
+        report = PackedReport.objects.get(raw_period="Q-2015-2")
+        self.assertIs(report.period, get_period("Q-2015-2"))
+        self.assertEquals(
+            PackedReport.objects.values_list("period", flat=True).get(raw_period="M-2015-01"),
+            get_period("M-2015-01")
+        )
+
+    def test_stores_integers(self):
+        values = PackedReport.objects.filter(raw_period="M-2015-01").values_list("period", flat=True)
+        with connection.cursor() as cursor:
+            sql, params = values.query.sql_with_params()
+            cursor.execute(sql, params)
+            self.assertEquals(cursor.fetchone()[0], pack_period("M-2015-01"))
+
+    def test_exact(self):
+        self.assertEquals(PackedReport.objects.get(period="W-2015-02").raw_period, get_period("W-2015-02"))
+        self.assertEquals(PackedReport.objects.get(period=get_period("Y-2015")).raw_period, get_period("Y-2015"))
+
+    def test_ordering(self):
+        periods = [
+            report.period for report in PackedReport.objects.filter(period__type="weekly").order_by("-period")
+        ]
+        self.assertEquals(periods, sorted(periods, reverse=True))
+
+    def test_lookups(self):
+        for lookup, value in [
+            ("within", "Y-2015"),
+            ("within", "M-2015-02"),
+            ("overlaps", ("2015-03-01", "2015-06-30")),
+            ("type", "quarterly"),
+            ("range_periods", ("M-2015-11", "M-2016-02")),
+        ]:
+            self.assertEquals(
+                self.periods(PackedReport.objects.filter(**{f"period__{lookup}": value})),
+                self.periods(PackedReport.objects.filter(**{f"raw_period__{lookup}": value}))
+            )
+
+    def test_range(self):
+        self.assertEquals(
+            self.periods(PackedReport.objects.filter(period__gte="M-2016-01", period__type="monthly")),
+            ["M-2016-01", "M-2016-02"]
+        )
+
+    def test_clean(self):
+        report = PackedReport(period="2015Q1")
+        with self.assertRaises(ValidationError):
+            report.full_clean()
+        self.assertEquals(PeriodOrdinalField().clean("Q-2015-1", None), get_period("Q-2015-1"))
+
+    def test_copy_periods(self):
+        PackedReport.objects.update(period=None)
+        operation = CopyPeriods("tests", "PackedReport", "raw_period", "period", batch_size=7)
+        operation.forwards(apps, connection.schema_editor())
+        for report in PackedReport.objects.all():
+            self.assertEquals(report.period, report.raw_period)
+        PackedReport.objects.update(raw_period=None)
+        operation.backwards(apps, connection.schema_editor())
+        self.assertEquals(self.periods(PackedReport.objects.all()), sorted(self.raws))
+        self.assertFalse(PackedReport.objects.filter(raw_period=None).exists())
+
+    def test_copy_periods_serializes(self):
+        for operation in [
+            CopyPeriods("tests", "PackedReport", "raw_period", "period", batch_size=7),
+            CopyPeriods("tests", "PackedReport", "raw_period", "period"),
+        ]:
+            source, imports = OperationWriter(operation, indentation=0).serialize()
+            namespace = {}
+            exec("\n".join(sorted(imports)) + "\n" + f"rebuilt = {source.rstrip(',')}", namespace)
+            self.assertEquals(namespace["rebuilt"].deconstruct(), operation.deconstruct())
+        self.assertEquals(
+            CopyPeriods("tests", "PackedReport", "raw_period", "period").deconstruct(),
+            ("CopyPeriods", ["tests", "PackedReport", "raw_period", "period"], {})
+        )
+
+
+class PeriodFieldLoadingTests(TestCase):
+
+    def setUp(self):
+        Report.objects.create(period="M-2015-01")
+        # written without validation, as legacy data from other code might be
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO tests_report (period, value) VALUES ('M-2015-13', 0)")
+
+    def test_trusted_period(self):
+        period = get_period("Q-2015-5", trusted=True)
+        self.assertEquals(period.raw_value, "Q-2015-5")
+        self.assertIs(get_period("Q-2015-5", trusted=True), period)
+        with self.assertRaises(ValidationError):
+            get_period("Q-2015-5")
+        with self.assertRaises(ValidationError):
+            get_period("Q-2015-5")
+
+    def test_trusted_then_strict_valid_period(self):
+        period = get_period("Q-2015-4", trusted=True)
+        self.assertIs(get_period("Q-2015-4"), period)
+        self.assertNotIn("Q-2015-4", period_cache.unverified)
+
+    def test_trusted_is_default(self):
+        periods = [report.period for report in Report.objects.order_by("pk")]
+        self.assertIs(periods[0], get_period("M-2015-01"))
+        self.assertEquals(periods[1].raw_value, "M-2015-13")
+
+    def test_trusted_load_does_not_disable_validation(self):
+        report = Report.objects.order_by("pk").last()
+        self.assertEquals(str(report.period), "M-2015-13")
+        with self.assertRaises(ValidationError):
+            get_period("M-2015-13")
+        with self.assertRaises(ValidationError):
+            report.full_clean()
+
+    @override_settings(PINAX_TYPES_PERIOD_FIELD_STRICT=True)
+    def test_strict(self):
+        self.assertIs(Report.objects.filter(period="M-2015-01").get().period, get_period("M-2015-01"))
+        with self.assertRaises(ValidationError):
+            list(Report.objects.all())
+
+    @override_settings(PINAX_TYPES_PERIOD_FIELD_DEFERRED=True)
+    def test_deferred(self):
+        period_cache.clear()
+        period = Report.objects.order_by("pk").first().period
+        self.assertIsInstance(period, SimpleLazyObject)
+        self.assertNotIn("M-2015-01", period_cache.periods)
+        self.assertEquals(period.get_start_end(), (datetime.date(2015, 1, 1), datetime.date(2015, 1, 31)))
+        self.assertEquals(period, get_period("M-2015-01"))
+        self.assertIsInstance(period, MonthlyPeriod)
+
+    @override_settings(PINAX_TYPES_PERIOD_FIELD_DEFERRED=True)
+    def test_deferred_is_interchangeable(self):
+        period = Report.objects.order_by("pk").first().period
+        other = get_period("M-2015-01")
+        self.assertTrue(period == other)
+        self.assertTrue(other == period)
+        self.assertFalse(period != other)
+        self.assertFalse(other != period)
+        self.assertIn(period, {other})
+        self.assertIn(other, {period})
+        self.assertEquals({other: 1}[period], 1)
+        self.assertNotEqual(get_period("Q-2015-1"), period)
+        self.assertEquals(get_period("M-2015-03") - period, 2)
+
+
+class PeriodChunkTests(TransactionTestCase):
+
+    def setUp(self):
+        Report.objects.bulk_create([
+            Report(period=raw, value=value)
+            for raw in period_range("M-2014-12", "M-2016-02")
+            for value in range(int(raw[-2:]))
+            if raw != "M-2015-06"
+        ] + [Report(period="Q-2015-1")])
+
+    def check_chunks(self, chunks):
+        chunks = list(chunks)
+        self.assertEquals(
+            [period for period, _ in chunks],
+            [get_period(raw) for raw in period_range("M-2015-01", "M-2015-12", True)]
+        )
+        for period, rows in chunks:
+            expected = 0 if period == get_period("M-2015-06") else period.ordinal % 12 + 1
+            self.assertEquals([row.value for row in rows], list(range(expected)))
+            self.assertTrue(all(row.period == period for row in rows))
+
+    def test_chunks(self):
+        with self.assertNumQueries(12):
+            self.check_chunks(iter_period_chunks(Report.objects.all(), "period", "M-2015-01", "M-2016-01"))
+
+    def test_periods_per_chunk(self):
+        with self.assertNumQueries(3):
+            self.check_chunks(iter_period_chunks(
+                Report.objects.all(), "period", "M-2015-01", "M-2015-12", inclusive=True, periods_per_chunk=5
+            ))
+
+    def test_prefetch(self):
+        self.check_chunks(iter_period_chunks(
+            Report.objects.all(), "period", "M-2015-01", "M-2016-01", periods_per_chunk=2, prefetch=True
+        ))
+
+    def test_values(self):
+        chunks = iter_period_chunks(Report.objects.values("period", "value"), "period", "Q-2015-1", "Q-2015-3")
+        self.assertEquals(
+            [(str(period), rows) for period, rows in chunks],
+            [("Q-2015-1", [{"period": get_period("Q-2015-1"), "value": 0}]), ("Q-2015-2", [])]
+        )
+
+    def test_abandoned_prefetch(self):
+        chunks = iter_period_chunks(Report.objects.all(), "period", "M-2015-01", "M-2016-01", prefetch=True)
+        self.assertEquals(next(chunks)[0], get_period("M-2015-01"))
+        chunks.close()
+
+
+class NormalizePeriodsTests(TestCase):
+
+    values = ["2015W3", "M-2015-01", "Jan 2015", "junk", "2015Q1", "2015", "1/2015", "M-2015-13", "W-2015-03"]
+
+    def setUp(self):
+        # legacy values, written without validation
+        with connection.cursor() as cursor:
+            for value in self.values:
+                cursor.execute("INSERT INTO tests_report (period, value) VALUES (%s, 0)", [value])
+        self.pks = list(Report.objects.order_by("pk").values_list("pk", flat=True))
+
+    def stored(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT period FROM tests_report ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+
+    def normalize(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("normalize_periods", "tests.Report", "period", *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_normalize(self):
+        stdout, stderr = self.normalize("--batch-size", "4")
+        self.assertEquals(self.stored(), [
+            "W-2015-03", "M-2015-01", "M-2015-01", "junk", "Q-2015-1", "Y-2015", "M-2015-01", "M-2015-13",
+            "W-2015-03",
+        ])
+        self.assertIn("9 rows scanned, changed 5, 2 unparseable", stdout)
+        self.assertEquals(stdout.count("up to pk"), 3)
+        self.assertIn(f"{self.pks[3]}: Cannot Parse: junk", stderr)
+        self.assertIn(f"{self.pks[7]}: Cannot Parse: M-2015-13", stderr)
+
+    def test_dry_run(self):
+        stdout, _ = self.normalize("--dry-run")
+        self.assertEquals(self.stored(), self.values)
+        self.assertIn("9 rows scanned, would change 5, 2 unparseable", stdout)
+
+    def test_start_after(self):
+        stdout, _ = self.normalize("--start-after", str(self.pks[4]))
+        self.assertEquals(self.stored(), self.values[:5] + ["Y-2015", "M-2015-01", "M-2015-13", "W-2015-03"])
+        self.assertIn("4 rows scanned, changed 2, 1 unparseable", stdout)
+
+    def test_not_a_period_field(self):
+        with self.assertRaises(CommandError):
+            call_command("normalize_periods", "tests.Report", "value")
+        with self.assertRaises(CommandError):
+            call_command("normalize_periods", "tests.Missing", "period")
+
+
+class ValidateManyTests(TestCase):
+
+    values = [
+        "566", "foo", "5.66", "true", "false", "2", "1000", " 3 ", "", "1e3", "-0", "NaN", "3", "foo",
+        None, 4, 2.5, ["1"],
+    ]
+
+    def scalar_invalid(self, type_key, values):
+        invalid = []
+        for index, value in enumerate(values):
+            try:
+                VALUE_TYPES[type_key].validate(value)
+            except (ValidationError, TypeError):
+                invalid.append(index)
+        return invalid
+
+    def test_matches_validate(self):
+        for type_key in VALUE_TYPES:
+            self.assertEquals(validate_many(type_key, self.values), self.scalar_invalid(type_key, self.values))
+
+    def test_mask(self):
+        self.assertEquals(validate_many("boolean", ["true", "no", "false"], mask=True), [False, True, False])
+
+    def test_empty(self):
+        self.assertEquals(validate_many("integer", []), [])
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_strings(self):
+        values = [value for value in self.values if isinstance(value, str)]
+        for type_key in VALUE_TYPES:
+            self.assertEquals(
+                validate_many(type_key, numpy.array(values)),
+                self.scalar_invalid(type_key, values)
+            )
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_integers(self):
+        values = numpy.array([[0, 1, 2], [3, 4, -5]])
+        for type_key in VALUE_TYPES:
+            self.assertEquals(
+                validate_many(type_key, values),
+                self.scalar_invalid(type_key, values.reshape(-1).tolist())
+            )
+        self.assertEquals(
+            validate_many("traffic-light", values, mask=True).tolist(),
+            [[True, False, False], [False, True, True]]
+        )
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class ToArrayTests(TestCase):
+
+    def setUp(self):
+        from pinax.types.arrays import to_array
+        self.to_array = to_array
+
+    def test_integer(self):
+        array = self.to_array("integer", ["566", " 3", "-12", 7])
+        self.assertEquals(array.dtype, numpy.int64)
+        self.assertEquals(array.tolist(), [566, 3, -12, 7])
+
+    def test_boolean(self):
+        array = self.to_array("boolean", ["true", "false", "true"])
+        self.assertEquals(array.dtype, numpy.bool_)
+        self.assertEquals(array.tolist(), [True, False, True])
+
+    def test_traffic_light(self):
+        array = self.to_array("traffic-light", ["1", "2", 3])
+        self.assertEquals(array.dtype, numpy.uint8)
+        self.assertEquals(array.tolist(), [1, 2, 3])
+
+    def test_decimal_types(self):
+        for type_key in ["decimal", "monetary", "hours", "percentage"]:
+            array = self.to_array(type_key, ["5.66", "56", "0.1"])
+            self.assertEquals(array.dtype, numpy.float64)
+            self.assertEquals(array.tolist(), [5.66, 56.0, 0.1])
+
+    def test_scaled(self):
+        array = self.to_array("monetary", ["56.60", "-0.01", "1E+2", "90071992547409.93"], scale=2)
+        self.assertEquals(array.dtype, numpy.int64)
+        self.assertEquals(array.tolist(), [5660, -1, 10000, 9007199254740993])
+
+    def test_scale_must_be_exact(self):
+        with self.assertRaises(ValidationError) as context:
+            self.to_array("monetary", ["1.00", "1.005", "NaN"], scale=2)
+        self.assertEquals(context.exception.params["indices"], [1, 2])
+
+    def test_reports_invalid_indices(self):
+        with self.assertRaises(ValidationError) as context:
+            self.to_array("integer", ["1", "foo", "2", "1e3"] + ["bar"] * 12 + [str(2 ** 63)])
+        self.assertEquals(context.exception.params["indices"], [1, 3] + list(range(4, 17)))
+        self.assertEquals(
+            context.exception.messages,
+            ["Incorrect integer values at indices 1, 3, 4, 5, 6, 7, 8, 9, 10, 11 and 5 more"]
+        )
+
+    def test_matches_validate_many(self):
+        values = ["566", "foo", "5.66", "true", "2", "1000", " 3 ", "", "NaN", None]
+        for type_key in VALUE_TYPES:
+            try:
+                self.to_array(type_key, values)
+            except ValidationError as error:
+                self.assertEquals(error.params["indices"], validate_many(type_key, values))
+
+    def test_scale_requires_decimal_type(self):
+        with self.assertRaises(ValueError):
+            self.to_array("integer", ["1"], scale=2)
+
+
+class DisplayManyTests(TestCase):
+
+    values = {
+        "monetary": [1000, decimal.Decimal("1234567.50"), decimal.Decimal("1.0"), decimal.Decimal("1.00"), 2.5, -3],
+        "percentage": [0.37, decimal.Decimal("0.125"), 1, 0.0, -0.0],
+        "hours": [1000, decimal.Decimal("7.5"), 0.25],
+        "traffic-light": [1, "2", 3, 1],
+        "integer": [566, "566", True],
+        "decimal": [decimal.Decimal("5.66"), 5.66],
+    }
+
+    def test_matches_display(self):
+        for type_key, values in self.values.items():
+            display = getattr(VALUE_TYPES[type_key], "display", str)
+            self.assertEquals(display_many(type_key, values), [display(value) for value in values])
+
+    def test_localized_matches_display_in_english(self):
+        for type_key, values in self.values.items():
+            self.assertEquals(display_many(type_key, values, localize=True), display_many(type_key, values))
+
+    @override_settings(USE_L10N=True, LANGUAGE_CODE="de")
+    def test_localized(self):
+        self.assertEquals(
+            display_many("monetary", [decimal.Decimal("1234567.50"), 1000, 1000], localize=True),
+            ["$1.234.567,50", "$1.000", "$1.000"]
+        )
+        self.assertEquals(display_many("percentage", [decimal.Decimal("0.375")], localize=True), ["37,500%"])
+        self.assertEquals(display_many("hours", [decimal.Decimal("7.5")], localize=True), ["7,5h"])
+        self.assertEquals(display_many("traffic-light", [3], localize=True), ["green"])
+
+    def test_memo_distinguishes_equal_values(self):
+        self.assertEquals(
+            display_many("monetary", [decimal.Decimal("1.0"), decimal.Decimal("1.00"), 1], localize=True),
+            ["$1.0", "$1.00", "$1"]
+        )
@@ -1,6 +1,8 @@
 import decimal
 
 from django.core.exceptions import ValidationError
+from django.utils import numberformat
+from django.utils.formats import get_format
 
 
 class IntegerValueType:
@@ -21,13 +23,15 @@ class IntegerValueType:
 
 class BooleanValueType:
 
+    choices = ["true", "false"]
+
     @classmethod
     def template_name(cls):
         return "indicators/_boolean_value.html"
 
     @classmethod
     def validate(cls, value):
-        if value not in ["true", "false"]:
+        if value not in cls.choices:
             raise ValidationError(
                 f"Incorrect boolean value: {value}"
             )
@@ -80,10 +84,13 @@ class HourValueType(DecimalValueType):
 
 class TrafficLightValueType:
 
+    choices = [1, 2, 3]
+    colors = {1: "red", 2: "yellow", 3: "green"}
+
     @classmethod
     def validate(cls, value):
         try:
-            if int(value) not in [1, 2, 3]:
+            if int(value) not in cls.choices:
                 raise ValidationError(
                     f"Incorrect traffic-light value: {value}"
                 )
@@ -98,7 +105,7 @@ class TrafficLightValueType:
 
     @classmethod
     def display(cls, value):
-        return {1: "red", 2: "yellow", 3: "green"}[int(value)]
+        return cls.colors[int(value)]
 
 
 VALUE_TYPES = {
@@ -110,3 +117,135 @@ VALUE_TYPES = {
     "traffic-light": TrafficLightValueType,
     "percentage": PercentageValueType
 }
+
+
+def is_valid(value_type, value):
+    """
+    whether value passes value_type.validate; values the validator cannot
+    handle at all (e.g. None) count as invalid
+    """
+    try:
+        value_type.validate(value)
+    except (ValidationError, TypeError, OverflowError):
+        return False
+    return True
+
+
+def invalid_flags(value_type, values):
+    """
+    whether each of the given values is invalid, validating each distinct
+    value only once
+    """
+    memo = {}
+    flags = []
+    for value in values:
+        try:
+            valid = memo[value]
+        except KeyError:
+            valid = memo[value] = is_valid(value_type, value)
+        except TypeError:
+            valid = is_valid(value_type, value)
+        flags.append(not valid)
+    return flags
+
+
+def validate_many(type_key, values, mask=False):
+    """
+    checks many values of the given value type at once without raising,
+    returning the indices of the values its validate would reject or, with
+    mask, a list of flags that are True for those values.
+
+    numpy arrays are checked with vectorized operations where possible and
+    give a numpy mask of the array's shape.
+    """
+    value_type = VALUE_TYPES[type_key]
+    if type(values).__module__.partition(".")[0] == "numpy":
+        # imported here so numpy is only loaded by callers passing arrays
+        from .arrays import invalid_array
+        invalid = invalid_array(value_type, values.reshape(-1))
+        return invalid.reshape(values.shape) if mask else invalid.nonzero()[0].tolist()
+    invalid = invalid_flags(value_type, values)
+    return invalid if mask else [index for index, flag in enumerate(invalid) if flag]
+
+
+# the most distinct values display_many remembers per call
+DISPLAY_MEMO_SIZE = 65536
+
+
+def display_formatter(value_type):
+    """
+    the function displaying one value as value_type.display does, without
+    its per-call method and dict lookups; str for types with no display
+    """
+    if issubclass(value_type, MonetaryValueType):
+        return lambda value: f"${value:,}"
+    if issubclass(value_type, PercentageValueType):
+        return lambda value: f"{value * 100}%"
+    if issubclass(value_type, HourValueType):
+        return lambda value: f"{value}h"
+    if issubclass(value_type, TrafficLightValueType):
+        colors = value_type.colors
+        return lambda value: colors[int(value)]
+    return str
+
+
+def localized_formatter(value_type):
+    """
+    like display_formatter, but with the active locale's decimal separator
+    and, for monetary values, its digit grouping
+    """
+    decimal_sep = get_format("DECIMAL_SEPARATOR")
+    thousand_sep = get_format("THOUSAND_SEPARATOR")
+    # monetary values are always grouped, by thousands unless the locale says
+    grouping = get_format("NUMBER_GROUPING") or 3
+
+    def number(value, **kwargs):
+        return numberformat.format(value, decimal_sep, use_l10n=False, **kwargs)
+
+    if issubclass(value_type, MonetaryValueType):
+        return lambda value: "$" + number(
+            value, grouping=grouping, thousand_sep=thousand_sep, force_grouping=True
+        )
+    if issubclass(value_type, PercentageValueType):
+        return lambda value: number(value * 100) + "%"
+    if issubclass(value_type, HourValueType):
+        return lambda value: number(value) + "h"
+    return display_formatter(value_type)
+
+
+def display_key(value):
+    """
+    the memo key for value: equal Decimals (1.0, 1.00) and floats (0.0, -0.0)
+    can display differently, so values other than ints and strings are keyed
+    by their string form
+    """
+    if type(value) in (int, str):
+        return value
+    return type(value), str(value)
+
+
+def display_many(type_key, values, localize=False):
+    """
+    displays many values of the given value type at once, as its display
+    would (or as str for types without one), returning a list of strings.
+
+    With localize, numbers use the active locale's separators. Localized
+    formatting is costlier, so each distinct value is then formatted once,
+    remembering up to DISPLAY_MEMO_SIZE of them.
+    """
+    value_type = VALUE_TYPES[type_key]
+    if not localize:
+        return list(map(display_formatter(value_type), values))
+    formatter = localized_formatter(value_type)
+    memo = {}
+    displayed = []
+    for value in values:
+        key = display_key(value)
+        try:
+            text = memo[key]
+        except KeyError:
+            text = formatter(value)
+            if len(memo) < DISPLAY_MEMO_SIZE:
+                memo[key] = text
+        displayed.append(text)
+    return displayed
@@ -22,6 +22,7 @@ DEFAULT_SETTINGS = dict(
         }
     },
     SITE_ID=1,
+    DEFAULT_AUTO_FIELD="django.db.models.AutoField",
     MIDDLEWARE_CLASSES=[],
     SECRET_KEY="notasecret",
 )
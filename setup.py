@@ -67,6 +67,9 @@ setup(
         "django>=2.2",
         "python-dateutil>=2.8.1"
     ],
+    extras_require={
+        "numpy": ["numpy>=1.16"]
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Environment :: Web Environment",